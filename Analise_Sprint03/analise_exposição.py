@@ -11,15 +11,23 @@
 # -------------------------------------------------------------------
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from scipy.stats import ttest_ind
+import os
+import sys
+
+# Carregamento compartilhado das planilhas (Analise_Sprint03/carregamento.py)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Analise_Sprint03.carregamento import carregar_grupo
+from Analise_Sprint03.figuras import emitir_figura
+
+# Figuras gravadas em Analise_Sprint03/imagens, qualquer que seja o diretório de execução
+PASTA_IMAGENS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "imagens")
 
 # Limiar da OMS para PM2.5 (μg/m³)
 PM25_LIMIAR = 25.0
 
-# Carregar dados com separador correto
-df = pd.read_csv("Divisao/planilha_alta.csv", sep=",", encoding="utf-8", engine="python")
+# Carregar dados (leitura tipada compartilhada: "-" já convertido em NaN)
+df = carregar_grupo("Alta Sensibilidade")
 
 # Confirmar as colunas
 print("✅ Colunas reais:", df.columns.tolist())
@@ -55,12 +63,12 @@ print(f"➡️ Exposição ALTA:  {grupo_alta.mean():.2f} óbitos")
 t_stat, p_val = ttest_ind(grupo_baixa, grupo_alta, equal_var=False)
 print(f"\n📊 Teste t: t = {t_stat:.2f}, p = {p_val:.4f}")
 
-# Visualização
-plt.figure(figsize=(8, 5))
-sns.boxplot(x="exposicao_alta", y="obitos", data=df)
-plt.xticks([0, 1], ["Baixa exposição", "Alta exposição"])
-plt.title("Óbitos por Doenças Respiratórias vs. Exposição a PM2.5")
-plt.ylabel("Número de Óbitos")
-plt.xlabel("Exposição a PM2.5 (>25 µg/m³)")
-plt.tight_layout()
-plt.show()
+# Visualização (registrada para a etapa de renderização em figuras.py)
+emitir_figura(
+    os.path.join(PASTA_IMAGENS, "boxplot_exposicao_pm25.png"), "boxplot_grupos",
+    {"tabela": df[["exposicao_alta", "obitos"]]},
+    x="exposicao_alta", y="obitos", figsize=(8, 5),
+    xticks={"ticks": [0, 1], "labels": ["Baixa exposição", "Alta exposição"]},
+    titulo="Óbitos por Doenças Respiratórias vs. Exposição a PM2.5",
+    ylabel="Número de Óbitos", xlabel="Exposição a PM2.5 (>25 µg/m³)",
+)
@@ -19,8 +19,6 @@
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 
 from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LinearRegression
@@ -29,29 +27,27 @@ from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import mean_squared_error, r2_score
 
 import warnings
+import os
+import sys
 warnings.filterwarnings("ignore")
 
-# Caminhos dos dados
-caminhos = {
-    "Alta Sensibilidade": "Divisao/planilha_alta.csv",
-    "Média Sensibilidade": "Divisao/planilha_media.csv",
-    "Baixa Sensibilidade": "Divisao/planilha_baixa.csv",
-    "Todas as Doenças": "Clustering/planilha/planilha_unificada_clusterizado.csv"
-}
+# Carregamento compartilhado das planilhas (Analise_Sprint03/carregamento.py)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Analise_Sprint03.carregamento import carregar_grupo, GRUPOS_ANALISE, FEATURES, TARGET
+from Analise_Sprint03.figuras import emitir_figura
 
-features = ["AREA_DESMATADA_KM2", "FRP", "RISCOFOGO", "PRECIPITACAO", "DIASEMCHUVA", "pm2.5_atm"]
-target = "OBITOS"
+# Figuras gravadas em Analise_Sprint03/imagens, qualquer que seja o diretório de execução
+PASTA_IMAGENS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "imagens")
+
+features = FEATURES
+target = TARGET
 
 # Avaliação e coleta de resultados
 resultados = []
 
-for grupo, caminho in caminhos.items():
-    df = pd.read_csv(caminho)
-
+for grupo in GRUPOS_ANALISE:
     # Preparo
-    df[target] = df[target].replace("-", np.nan)
-    for col in features + [target]:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
+    df = carregar_grupo(grupo)
     df = df[features + [target]].dropna()
     for col in df.columns:
         df[col] = df[col].fillna(df[col].median())
@@ -100,40 +96,38 @@ print("\n📊 Comparação de Desempenho:")
 print(df_resultados)
 
 # Correlação com variáveis ambientais (exemplo Todas as Doenças)
-df_todas = pd.read_csv("Clustering/planilha/planilha_unificada_clusterizado.csv")
-df_todas[target] = pd.to_numeric(df_todas[target], errors="coerce")
+df_todas = carregar_grupo("Todas as Doenças")
 corr = df_todas[["OBITOS", "FRP", "DIASEMCHUVA", "pm2.5_atm"]].corr()["OBITOS"].drop("OBITOS")
 print("\n📈 Correlação com variáveis ambientais:")
 print(corr)
 
-# Visualização (opcional)
-sns.pairplot(df_todas[["OBITOS", "FRP", "DIASEMCHUVA", "pm2.5_atm"]])
-plt.suptitle("Relação entre Óbitos e variáveis ambientais", y=1.02)
-plt.tight_layout()
-plt.show()
+# Visualização (figuras registradas para a etapa de renderização em figuras.py)
+emitir_figura(
+    os.path.join(PASTA_IMAGENS, "pairplot_todas.png"), "pairplot",
+    {"tabela": df_todas[["OBITOS", "FRP", "DIASEMCHUVA", "pm2.5_atm"]]},
+    suptitulo="Relação entre Óbitos e variáveis ambientais", y_suptitulo=1.02, bbox_inches="tight",
+)
 
 
-def scatter_with_trend(x, y, xlabel, ylabel, title):
-    plt.figure(figsize=(8,5))
-    sns.regplot(x=x, y=y, data=df, scatter_kws={"s": 30}, line_kws={"color": "red"})
-    plt.xlabel(xlabel)
-    plt.ylabel(ylabel)
-    plt.title(title)
-    plt.grid(True)
-    plt.show()
+def scatter_with_trend(x, y, xlabel, ylabel, title, nome):
+    emitir_figura(
+        os.path.join(PASTA_IMAGENS, f"{nome}.png"), "regressao", {"tabela": df[[x, y]]},
+        paineis=[{"x": x, "y": y, "scatter_kws": {"s": 30}, "line_kws": {"color": "red"}}],
+        figsize=(8, 5), xlabel=xlabel, ylabel=ylabel, titulo=title, grid=True,
+    )
 
 # Correlação OBITOS vs FRP
-scatter_with_trend('FRP', 'OBITOS', 'FRP (Focos de Queimada)', 'Óbitos', 'Correlação entre FRP e Óbitos')
+scatter_with_trend('FRP', 'OBITOS', 'FRP (Focos de Queimada)', 'Óbitos', 'Correlação entre FRP e Óbitos', 'tendencia_frp')
 
 # Correlação OBITOS vs PM2.5
-scatter_with_trend('PM2.5_atm', 'OBITOS', 'PM2.5 Atmosférico', 'Óbitos', 'Correlação entre PM2.5 e Óbitos')
+scatter_with_trend('pm2.5_atm', 'OBITOS', 'PM2.5 Atmosférico', 'Óbitos', 'Correlação entre PM2.5 e Óbitos', 'tendencia_pm25')
 
 # Correlação OBITOS vs Dias sem chuva
-scatter_with_trend('DIASEMCHUVA', 'OBITOS', 'Dias sem chuva', 'Óbitos', 'Correlação entre Seca e Óbitos')
+scatter_with_trend('DIASEMCHUVA', 'OBITOS', 'Dias sem chuva', 'Óbitos', 'Correlação entre Seca e Óbitos', 'tendencia_seca')
 
 # Heatmap da matriz de correlação
-plt.figure(figsize=(6,5))
-corr = df[['OBITOS', 'FRP', 'PM2.5_atm', 'DIASEMCHUVA']].corr()
-sns.heatmap(corr, annot=True, cmap='coolwarm', fmt=".2f")
-plt.title("Matriz de Correlação entre Variáveis")
-plt.show()
\ No newline at end of file
+corr = df[['OBITOS', 'FRP', 'pm2.5_atm', 'DIASEMCHUVA']].corr()
+emitir_figura(
+    os.path.join(PASTA_IMAGENS, "correlacao_variaveis.png"), "heatmap", {"tabela": corr},
+    figsize=(6, 5), titulo="Matriz de Correlação entre Variáveis",
+)
@@ -0,0 +1,185 @@
+# -------------------------------------------------------------------------------------------
+# MOTOR DE BOOTSTRAP PARALELO E REPRODUTÍVEL PARA O RMSE
+#
+# Objetivo:
+# Substituir o laço serial de ic_th.py (1000 train_test_split + fit por modelo e por grupo,
+# sem semente) por um motor que:
+# - distribui as iterações entre processos (ProcessPoolExecutor);
+# - dá a cada iteração sua própria semente, derivada de uma SeedSequence, de modo que o
+#   resultado é o mesmo qualquer que seja o número de processos;
+# - para antes das N iterações quando o intervalo de confiança já convergiu.
+#
+# Reprodutibilidade:
+# A iteração i sempre usa a i-ésima semente filha da SeedSequence(semente). Como a divisão
+# treino/teste depende só dessa semente, dois modelos avaliados com a mesma semente base
+# veem exatamente as mesmas divisões (o que torna o teste t pareado de fato pareado).
+#
+# Regressão linear em lote:
+# Para LinearRegression, bootstrap_rmse_lr monta de uma vez todos os índices de treino/teste
+# (os mesmos do train_test_split com a semente de cada iteração) e resolve todas as equações
+# normais em uma única chamada do NumPy. A distribuição de RMSE é a mesma de bootstrap_rmse.
+#
+# Convergência:
+# As iterações rodam em rodadas de TAMANHO_RODADA. Ao fim de cada rodada o IC 95% é
+# recalculado; se nenhum dos limites variar mais que `tolerancia` (relativo) em relação
+# à rodada anterior, o bootstrap para. O critério depende só dos valores já calculados,
+# então também é independente do número de processos.
+# -------------------------------------------------------------------------------------------
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from numpy.linalg import LinAlgError
+from sklearn.base import clone
+from sklearn.metrics import mean_squared_error
+from sklearn.model_selection import train_test_split
+
+TAMANHO_RODADA = 100
+MIN_ITERACOES = 200
+
+# Estado de cada processo, definido uma vez no inicializador para não reenviar X e y a cada tarefa
+_estado = {}
+
+
+def sementes_iteracoes(semente, n_iter):
+    # Uma semente inteira por iteração, sempre a mesma para o mesmo (semente, i)
+    filhas = np.random.SeedSequence(semente).spawn(n_iter)
+    return [int(f.generate_state(1)[0]) for f in filhas]
+
+
+def _iniciar_worker(modelo, X, y, test_size):
+    _estado.update(modelo=modelo, X=X, y=y, test_size=test_size)
+
+
+def _rmse_iteracao(semente_iteracao, modelo, X, y, test_size):
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=test_size, random_state=semente_iteracao
+    )
+    modelo = clone(modelo)
+    modelo.fit(X_train, y_train)
+    y_pred = modelo.predict(X_test)
+    return np.sqrt(mean_squared_error(y_test, y_pred))
+
+
+def _rmse_lote(sementes_lote):
+    return [
+        _rmse_iteracao(s, _estado["modelo"], _estado["X"], _estado["y"], _estado["test_size"])
+        for s in sementes_lote
+    ]
+
+
+def intervalo_confianca(rmses, nivel=0.95):
+    alfa = (1 - nivel) / 2 * 100
+    return np.percentile(rmses, [alfa, 100 - alfa])
+
+
+def _convergiu(ic_anterior, ic_atual, tolerancia):
+    variacao = np.abs(ic_atual - ic_anterior) / np.maximum(np.abs(ic_anterior), 1e-12)
+    return bool(np.all(variacao < tolerancia))
+
+
+def bootstrap_rmse(modelo, X, y, n_iter=1000, test_size=0.3, semente=42,
+                   n_processos=None, tolerancia=None):
+    """Distribuição de RMSE por bootstrap; tolerancia=None roda sempre as n_iter iterações."""
+    X = np.asarray(X)
+    y = np.asarray(y)
+    sementes = sementes_iteracoes(semente, n_iter)
+    n_processos = n_processos or os.cpu_count() or 1
+
+    rmses = []
+    ic_anterior = None
+
+    executor = None
+    if n_processos > 1:
+        executor = ProcessPoolExecutor(
+            max_workers=n_processos,
+            initializer=_iniciar_worker,
+            initargs=(modelo, X, y, test_size),
+        )
+    else:
+        _iniciar_worker(modelo, X, y, test_size)
+
+    try:
+        for inicio in range(0, n_iter, TAMANHO_RODADA):
+            sementes_rodada = sementes[inicio:inicio + TAMANHO_RODADA]
+
+            if executor is None:
+                rmses.extend(_rmse_lote(sementes_rodada))
+            else:
+                # Divide a rodada em lotes contíguos; map preserva a ordem das iterações
+                lotes = np.array_split(sementes_rodada, min(n_processos, len(sementes_rodada)))
+                for resultado in executor.map(_rmse_lote, [list(map(int, l)) for l in lotes]):
+                    rmses.extend(resultado)
+
+            if tolerancia is None or len(rmses) < MIN_ITERACOES:
+                continue
+
+            ic_atual = intervalo_confianca(rmses)
+            if ic_anterior is not None and _convergiu(ic_anterior, ic_atual, tolerancia):
+                break
+            ic_anterior = ic_atual
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return np.array(rmses)
+
+
+def iteracoes_ate_convergir(rmses, tolerancia):
+    # Reproduz o critério de parada de bootstrap_rmse sobre uma distribuição já calculada
+    ic_anterior = None
+    for fim in range(TAMANHO_RODADA, len(rmses) + TAMANHO_RODADA, TAMANHO_RODADA):
+        fim = min(fim, len(rmses))
+        if fim < MIN_ITERACOES:
+            continue
+        ic_atual = intervalo_confianca(rmses[:fim])
+        if ic_anterior is not None and _convergiu(ic_anterior, ic_atual, tolerancia):
+            return fim
+        ic_anterior = ic_atual
+    return len(rmses)
+
+
+def indices_divisoes(n, sementes, test_size):
+    # Índices de treino e teste de cada iteração, idênticos aos do train_test_split
+    # (ShuffleSplit: permutação do RandomState da semente, teste = primeiros ceil(test_size * n))
+    n_teste = int(np.ceil(test_size * n))
+    permutacoes = np.stack([np.random.RandomState(s).permutation(n) for s in sementes])
+    return permutacoes[:, n_teste:], permutacoes[:, :n_teste]
+
+
+def minimos_quadrados_lote(X_lote, y_lote):
+    """Ajusta B regressões lineares (com intercepto) de uma vez; X_lote (B, n, p), y_lote (B, n)."""
+    media_X = X_lote.mean(axis=1)
+    media_y = y_lote.mean(axis=1)
+    Xc = X_lote - media_X[:, None, :]
+    yc = y_lote - media_y[:, None]
+
+    # Equações normais centradas: (Xc'Xc) b = Xc'yc, todas resolvidas na mesma chamada
+    XtX = np.einsum("bni,bnj->bij", Xc, Xc)
+    Xty = np.einsum("bni,bn->bi", Xc, yc)
+    try:
+        coef = np.linalg.solve(XtX, Xty[..., None])[..., 0]
+    except LinAlgError:
+        # Sistema singular em algum lote: solução de norma mínima, como o lstsq do sklearn
+        coef = np.einsum("bij,bj->bi", np.linalg.pinv(XtX), Xty)
+
+    intercepto = media_y - np.einsum("bi,bi->b", media_X, coef)
+    return coef, intercepto
+
+
+def bootstrap_rmse_lr(X, y, n_iter=1000, test_size=0.3, semente=42, tolerancia=None):
+    """Mesma distribuição de bootstrap_rmse(LinearRegression(), ...), calculada em lote."""
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y, dtype=float)
+    sementes = sementes_iteracoes(semente, n_iter)
+    idx_treino, idx_teste = indices_divisoes(len(y), sementes, test_size)
+
+    coef, intercepto = minimos_quadrados_lote(X[idx_treino], y[idx_treino])
+
+    y_pred = np.einsum("bnp,bp->bn", X[idx_teste], coef) + intercepto[:, None]
+    rmses = np.sqrt(np.mean((y[idx_teste] - y_pred) ** 2, axis=1))
+
+    if tolerancia is not None:
+        rmses = rmses[:iteracoes_ate_convergir(rmses, tolerancia)]
+    return rmses
@@ -0,0 +1,78 @@
+# -------------------------------------------------------------------------------------------
+# CARREGAMENTO COMPARTILHADO DAS PLANILHAS DE ANÁLISE
+#
+# Objetivo:
+# Centralizar a leitura e a limpeza das planilhas usadas nas análises (Divisao/planilha_*.csv,
+# planilha_unificada_clusterizado.csv e planilha_unificada.csv), que antes era repetida em
+# cada script com read_csv → replace("-", NaN) → to_numeric → preenchimento.
+#
+# Esquema declarado:
+# - FEATURES e TARGET são as variáveis usadas em todos os modelos.
+# - GRUPOS define o caminho e o separador de cada planilha.
+#
+# Memoização:
+# Cada planilha é lida e tipada uma única vez por processo (e cada versão preenchida também).
+# As funções devolvem cópias, então um script pode alterar o DataFrame sem afetar os demais.
+# Se o arquivo mudar em disco (mtime), ele é lido novamente.
+# -------------------------------------------------------------------------------------------
+
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FEATURES = ["AREA_DESMATADA_KM2", "FRP", "RISCOFOGO", "PRECIPITACAO", "DIASEMCHUVA", "pm2.5_atm"]
+TARGET = "OBITOS"
+COLUNAS_NUMERICAS = FEATURES + [TARGET]
+
+GRUPOS = {
+    "Alta Sensibilidade": {"caminho": "Divisao/planilha_alta.csv", "sep": ","},
+    "Média Sensibilidade": {"caminho": "Divisao/planilha_media.csv", "sep": ","},
+    "Baixa Sensibilidade": {"caminho": "Divisao/planilha_baixa.csv", "sep": ","},
+    "Todas as Doenças": {"caminho": "Clustering/planilha/planilha_unificada_clusterizado.csv", "sep": ","},
+    "Unificada": {"caminho": "planilha_unificada.csv", "sep": ";"},
+}
+
+# Os quatro grupos comparados nas análises da Sprint 03
+GRUPOS_ANALISE = ["Alta Sensibilidade", "Média Sensibilidade", "Baixa Sensibilidade", "Todas as Doenças"]
+
+
+def caminho_grupo(grupo):
+    return os.path.join(RAIZ, GRUPOS[grupo]["caminho"])
+
+
+@lru_cache(maxsize=None)
+def _ler_tabela(grupo, mtime):
+    df = pd.read_csv(caminho_grupo(grupo), sep=GRUPOS[grupo]["sep"])
+
+    # Substitui "-" por NaN e converte as colunas numéricas
+    df[COLUNAS_NUMERICAS] = df[COLUNAS_NUMERICAS].replace("-", np.nan)
+    df[COLUNAS_NUMERICAS] = df[COLUNAS_NUMERICAS].apply(pd.to_numeric, errors="coerce")
+    return df
+
+
+@lru_cache(maxsize=None)
+def _preencher_tabela(grupo, mtime, preenchimento):
+    df = _ler_tabela(grupo, mtime).copy()
+    if preenchimento == "mediana":
+        valores = df[COLUNAS_NUMERICAS].median()
+    elif preenchimento == "media":
+        valores = df[COLUNAS_NUMERICAS].mean()
+    else:
+        raise ValueError(f"Preenchimento desconhecido: {preenchimento}")
+    df[COLUNAS_NUMERICAS] = df[COLUNAS_NUMERICAS].fillna(valores)
+    return df
+
+
+def carregar_grupo(grupo, preenchimento=None):
+    """Planilha tipada do grupo; preenchimento = None, "mediana" ou "media" nas colunas numéricas."""
+    if grupo not in GRUPOS:
+        raise KeyError(f"Grupo desconhecido: {grupo}. Opções: {list(GRUPOS)}")
+
+    mtime = os.stat(caminho_grupo(grupo)).st_mtime_ns
+    if preenchimento is None:
+        return _ler_tabela(grupo, mtime).copy()
+    return _preencher_tabela(grupo, mtime, preenchimento).copy()
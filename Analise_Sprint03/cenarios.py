@@ -18,6 +18,11 @@
 # - Investigar a heterogeneidade da performance por doença
 # - Avaliar se a clusterização por CID-10 gera ganhos de precisão
 # - Apoiar decisões futuras sobre especialização de modelos
+#
+# Execução paralela:
+# Cada CID é um treino independente, então os grupos são distribuídos entre processos
+# (ProcessPoolExecutor). A matriz de features/alvo é enviada uma única vez a cada processo,
+# no inicializador; cada tarefa recebe só as posições das linhas do seu CID.
 # -------------------------------------------------------------------------------------------
 
 import pandas as pd
@@ -26,29 +31,39 @@ from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import mean_squared_error, r2_score
-import matplotlib.pyplot as plt
-import seaborn as sns
 import warnings
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 
 warnings.filterwarnings("ignore")
 
-# Caminho da base clusterizada
-caminho = "Clustering/planilha/planilha_unificada_clusterizado.csv"
+# Carregamento compartilhado das planilhas (Analise_Sprint03/carregamento.py)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Analise_Sprint03.carregamento import carregar_grupo, FEATURES, TARGET
+from Analise_Sprint03.figuras import emitir_figura
+
+# Figuras gravadas em Analise_Sprint03/imagens, qualquer que seja o diretório de execução
+PASTA_IMAGENS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "imagens")
 
 # Colunas
-features = ["AREA_DESMATADA_KM2", "FRP", "RISCOFOGO", "PRECIPITACAO", "DIASEMCHUVA", "pm2.5_atm"]
-target = "OBITOS"
+features = FEATURES
+target = TARGET
 coluna_cid = "Categoria CID-10"
 
-# Carregamento
-df = pd.read_csv(caminho)
-df[target] = df[target].replace("-", np.nan)
-for col in features + [target]:
-    df[col] = pd.to_numeric(df[col], errors="coerce")
+N_PROCESSOS = None  # None = todos os núcleos disponíveis
+
+# Dados somente leitura de cada processo, definidos uma vez no inicializador
+_dados = {}
+
+
+def _iniciar_worker(valores):
+    _dados["valores"] = valores
 
-resultados = []
-for cid, grupo in df.groupby(coluna_cid):
-    grupo = grupo[features + [target]].copy()
+
+def avaliar_cid(cid, posicoes):
+    # Colunas: features..., target (mesma ordem de features + [target])
+    grupo = pd.DataFrame(_dados["valores"][posicoes], columns=features + [target])
     grupo = grupo.fillna(grupo.median())
 
     scaler = StandardScaler()
@@ -58,7 +73,7 @@ for cid, grupo in df.groupby(coluna_cid):
     y = grupo[target]
 
     if len(grupo) < 10 or y.nunique() <= 1:
-        continue
+        return None
 
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.3, random_state=42)
     modelo = RandomForestRegressor(random_state=42)
@@ -69,26 +84,39 @@ for cid, grupo in df.groupby(coluna_cid):
     r2 = r2_score(y_test, y_pred)
 
     # Pegar apenas o código (ex: J45)
-    codigo_cid = cid.strip().split()[0]  
+    codigo_cid = cid.strip().split()[0]
 
-    resultados.append({
+    return {
         "CID-10": codigo_cid,
         "RMSE": round(rmse, 4),
         "R2": round(r2, 4),
         "N": len(grupo)
-    })
+    }
+
+
+def treinar_por_cid(df, n_processos=N_PROCESSOS):
+    valores = df[features + [target]].to_numpy(dtype=float)
+    grupos = df.reset_index(drop=True).groupby(coluna_cid).indices
+
+    with ProcessPoolExecutor(max_workers=n_processos, initializer=_iniciar_worker, initargs=(valores,)) as executor:
+        futuros = [executor.submit(avaliar_cid, cid, posicoes) for cid, posicoes in grupos.items()]
+        resultados = [f.result() for f in futuros]
+    return [r for r in resultados if r is not None]
 
-df_resultados = pd.DataFrame(resultados).sort_values("RMSE")
-print(df_resultados)
 
+if __name__ == "__main__":
+    # Carregamento da base clusterizada
+    df = carregar_grupo("Todas as Doenças")
+    resultados = treinar_por_cid(df)
 
-plt.figure(figsize=(10, 5))
-sns.barplot(data=df_resultados, x="CID-10", y="RMSE", palette="crest")
+    df_resultados = pd.DataFrame(resultados).sort_values("RMSE")
+    print(df_resultados)
 
-plt.xticks(rotation=90, fontsize=10)
-plt.title("Figura 24 – Comparação de RMSE dos modelos Random Forest por CID-10 (Clusterizado)", fontsize=12)
-plt.xlabel("CID-10")
-plt.ylabel("RMSE")
-plt.tight_layout()
-plt.savefig("figura24_rmse_clusterizado_melhorado.png")
-plt.show()
+    # Figura registrada para a etapa de renderização (Analise_Sprint03/figuras.py)
+    emitir_figura(
+        os.path.join(PASTA_IMAGENS, "figura24_rmse_clusterizado_melhorado.png"), "barras", {"tabela": df_resultados},
+        x="CID-10", y="RMSE", palette="crest", figsize=(10, 5),
+        xticks={"rotation": 90, "fontsize": 10},
+        titulo="Figura 24 – Comparação de RMSE dos modelos Random Forest por CID-10 (Clusterizado)", fontsize_titulo=12,
+        xlabel="CID-10", ylabel="RMSE",
+    )
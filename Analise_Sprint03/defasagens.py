@@ -0,0 +1,133 @@
+# -------------------------------------------------------------------------------------------
+# DEFASAGENS E JANELAS MÓVEIS DAS VARIÁVEIS DE EXPOSIÇÃO
+#
+# Objetivo:
+# Todos os modelos usam só as variáveis ambientais do mesmo mês, mas os óbitos respiratórios
+# em Manaus podem responder à estação de queimadas com semanas ou meses de atraso (o
+# temporal.py só mostra isso visualmente). Aqui são calculadas, sobre a série (ano, mês):
+# - defasagens 1..k de VARIAVEIS_DEFASAGEM (valor de k meses antes);
+# - médias, máximos e somas móveis em JANELAS meses (terminando no mês), também defasadas.
+#
+# Funcionamento:
+# - A série do painel compacto (Analise_Sprint03/painel.py) é colocada em um calendário mensal
+#   contínuo: meses ausentes na planilha viram NaN, então "1 mês antes" é sempre o mês anterior
+#   do calendário, não a linha anterior.
+# - As janelas de todas as variáveis são calculadas de uma vez (sliding_window_view) e ficam em
+#   cache (Analise_Sprint03/.cache_defasagens, chave = hash da série + tamanho da janela).
+#   Defasar uma janela é só deslocar o array em cache, então varrer defasagens não recalcula nada.
+# - O resultado tem uma linha por mês e entra no painel como variáveis extras (adicionar_ao_painel):
+#   a junção com os CIDs é por indexação (broadcast), sem merge por CID.
+# -------------------------------------------------------------------------------------------
+
+import os
+import sys
+
+import joblib
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(RAIZ)
+from Analise_Sprint03.painel import montar_painel, matriz_design
+
+PASTA_CACHE = os.path.join(RAIZ, "Analise_Sprint03", ".cache_defasagens")
+
+# === Configuração ===
+VARIAVEIS_DEFASAGEM = ["FRP", "pm2.5_atm", "DIASEMCHUVA", "RISCOFOGO"]
+MAX_DEFASAGEM = 3
+JANELAS = [2, 3, 6]
+ESTATISTICAS = {"media": np.mean, "max": np.max, "soma": np.sum}
+
+
+def serie_mensal(painel, variaveis=VARIAVEIS_DEFASAGEM):
+    """Série (n_meses_calendario, n_variaveis) sem lacunas e a posição de cada período do painel nela."""
+    meses = painel["periodos"][:, 0].astype(int) * 12 + painel["periodos"][:, 1].astype(int) - 1
+    posicao = meses - meses.min()
+    colunas = [painel["features"].index(v) for v in variaveis]
+
+    serie = np.full((posicao.max() + 1, len(colunas)), np.nan)
+    serie[posicao] = painel["ambiente"][:, colunas]
+    return serie, posicao
+
+
+def janelas_base(serie, janela, usar_cache=True):
+    """Estatísticas móveis da janela terminando em cada mês: {estatística: (n_meses, n_variaveis)}."""
+    caminho_cache = os.path.join(PASTA_CACHE, f"{joblib.hash((serie, janela))}.npz")
+    if usar_cache and os.path.exists(caminho_cache):
+        with np.load(caminho_cache) as arquivo:
+            return {nome: arquivo[nome] for nome in ESTATISTICAS}
+
+    # Os primeiros janela-1 meses não têm janela completa e ficam NaN, como no rolling(janela) do pandas
+    preenchida = np.vstack([np.full((janela - 1, serie.shape[1]), np.nan), serie])
+    blocos = sliding_window_view(preenchida, janela, axis=0)  # (n_meses, n_variaveis, janela)
+    resultado = {nome: funcao(blocos, axis=-1) for nome, funcao in ESTATISTICAS.items()}
+
+    if usar_cache:
+        os.makedirs(PASTA_CACHE, exist_ok=True)
+        np.savez(caminho_cache, **resultado)
+    return resultado
+
+
+def deslocar(matriz, defasagem):
+    if defasagem == 0:
+        return matriz
+    deslocada = np.full_like(matriz, np.nan)
+    deslocada[defasagem:] = matriz[:-defasagem]
+    return deslocada
+
+
+def atributos_defasagem(painel, variaveis=VARIAVEIS_DEFASAGEM, defasagens=range(1, MAX_DEFASAGEM + 1),
+                        janelas=JANELAS, defasagens_janela=(0,), usar_cache=True):
+    """Tabela (uma linha por período do painel) com as defasagens e as janelas móveis."""
+    serie, posicao = serie_mensal(painel, variaveis)
+
+    blocos, nomes = [], []
+    for defasagem in defasagens:
+        blocos.append(deslocar(serie, defasagem))
+        nomes += [f"{v}_lag{defasagem}" for v in variaveis]
+
+    for janela in janelas:
+        base = janelas_base(serie, janela, usar_cache)
+        for estatistica, matriz in base.items():
+            for defasagem in defasagens_janela:
+                blocos.append(deslocar(matriz, defasagem))
+                sufixo = f"_lag{defasagem}" if defasagem else ""
+                nomes += [f"{v}_{estatistica}{janela}{sufixo}" for v in variaveis]
+
+    atributos = np.hstack(blocos)[posicao]
+    return pd.DataFrame(atributos, columns=nomes)
+
+
+def adicionar_ao_painel(painel, atributos):
+    """Novo painel com os atributos mensais como variáveis extras (usadas por matriz_design)."""
+    return {
+        **painel,
+        "ambiente": np.hstack([painel["ambiente"], atributos.to_numpy(dtype=float)]),
+        "features": painel["features"] + list(atributos.columns),
+    }
+
+
+if __name__ == "__main__":
+    painel = montar_painel()
+    atributos = atributos_defasagem(painel, defasagens=range(1, 7))
+    painel_defasado = adicionar_ao_painel(painel, atributos)
+    print(f"⏳ {atributos.shape[1]} atributos de defasagem/janela para {len(atributos)} meses")
+
+    # Varredura de defasagens: correlação com o total mensal de óbitos (soma dos CIDs)
+    obitos_mes = np.nansum(painel["obitos"], axis=1)
+    linhas = []
+    for variavel in VARIAVEIS_DEFASAGEM:
+        for defasagem in range(0, 7):
+            coluna = variavel if defasagem == 0 else f"{variavel}_lag{defasagem}"
+            valores = painel_defasado["ambiente"][:, painel_defasado["features"].index(coluna)]
+            validos = ~np.isnan(valores)
+            linhas.append({
+                "variavel": variavel, "defasagem": defasagem,
+                "correlacao_obitos": np.corrcoef(valores[validos], obitos_mes[validos])[0, 1],
+            })
+    varredura = pd.DataFrame(linhas).pivot(index="defasagem", columns="variavel", values="correlacao_obitos")
+    print(varredura.round(3).to_string())
+
+    X, y, _, _ = matriz_design(painel_defasado, apenas_com_obitos=True)
+    print(f"✅ Matriz com defasagens: X {X.shape}")
@@ -0,0 +1,238 @@
+# -------------------------------------------------------------------------------------------
+# PIPELINE DE FIGURAS (ESPECIFICAÇÃO NAS ANÁLISES, RENDERIZAÇÃO EM ETAPA SEPARADA)
+#
+# Objetivo:
+# Tirar a geração de gráficos de dentro das análises. Antes, cada script chamava plt.show(),
+# o que travava execuções em lote, e o desenho das figuras ocupava boa parte do tempo total.
+#
+# Funcionamento:
+# - As análises só chamam emitir_figura(caminho, tipo, dados, **opcoes): os dados (DataFrames,
+#   arrays) e as opções do gráfico são gravados como especificação em .figuras/ na raiz.
+# - A etapa de renderização (python Analise_Sprint03/figuras.py) desenha todas as figuras sem
+#   interface gráfica (backend Agg), em paralelo (ProcessPoolExecutor), e grava cada PNG no
+#   caminho indicado pela análise.
+# - Cada especificação tem um hash dos dados e das opções. Figuras cujo hash não mudou desde a
+#   última renderização (e cujo PNG ainda existe) são puladas. Use "--forcar" para redesenhar
+#   tudo, por exemplo depois de alterar um dos RENDERIZADORES.
+#
+# Tipos de figura: ver RENDERIZADORES (linhas, barras, boxplot, boxplot_grupos, dispersao,
+# regressao, pairplot, heatmap, clusters).
+# -------------------------------------------------------------------------------------------
+
+import hashlib
+import json
+import os
+import pickle
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import seaborn as sns
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PASTA_SPECS = os.path.join(RAIZ, ".figuras")
+CAMINHO_ESTADO = os.path.join(PASTA_SPECS, "estado.json")
+N_PROCESSOS = None  # None = todos os núcleos disponíveis
+
+
+# === Emissão (chamada pelas análises) ===
+def hash_figura(tipo, dados, opcoes):
+    h = hashlib.sha1(tipo.encode("utf-8"))
+    for nome in sorted(dados):
+        valor = dados[nome]
+        h.update(nome.encode("utf-8"))
+        if isinstance(valor, (pd.DataFrame, pd.Series)):
+            h.update(repr(list(valor.columns) if isinstance(valor, pd.DataFrame) else valor.name).encode("utf-8"))
+            h.update(pd.util.hash_pandas_object(valor, index=True).values.tobytes())
+        else:
+            h.update(np.ascontiguousarray(valor).tobytes())
+    h.update(json.dumps(opcoes, sort_keys=True, default=str).encode("utf-8"))
+    return h.hexdigest()
+
+
+def emitir_figura(caminho, tipo, dados, **opcoes):
+    """Registra a figura; o PNG é gerado na etapa de renderização. Caminho relativo ao diretório atual."""
+    if tipo not in RENDERIZADORES:
+        raise ValueError(f"Tipo de figura desconhecido: {tipo}. Opções: {list(RENDERIZADORES)}")
+
+    caminho = os.path.abspath(caminho)
+    spec = {"caminho": caminho, "tipo": tipo, "dados": dados, "opcoes": opcoes,
+            "hash": hash_figura(tipo, dados, opcoes)}
+
+    os.makedirs(PASTA_SPECS, exist_ok=True)
+    chave = hashlib.sha1(caminho.encode("utf-8")).hexdigest()[:16]
+    with open(os.path.join(PASTA_SPECS, f"{chave}.pkl"), "wb") as f:
+        pickle.dump(spec, f)
+    print(f"🖼️  Figura registrada: {os.path.relpath(caminho, RAIZ)}")
+
+
+# === Renderizadores: (dados, opcoes) → desenham na figura atual ===
+def _plotar_series(tabela, opcoes):
+    for serie in opcoes["series"]:
+        estilo = {k: v for k, v in serie.items() if k != "y"}
+        plt.plot(tabela[opcoes["x"]], tabela[serie["y"]], **estilo)
+
+
+def _linhas(dados, opcoes):
+    tabela = dados["tabela"]
+    if "painel" not in opcoes:
+        _plotar_series(tabela, opcoes)
+        return
+
+    # Um painel por valor da coluna "painel", lado a lado; legenda e ylabel só no primeiro
+    paineis = list(tabela[opcoes["painel"]].unique())
+    for i, nome in enumerate(paineis, start=1):
+        eixo = plt.subplot(1, len(paineis), i, sharex=plt.gca() if i > 1 else None)
+        _plotar_series(tabela[tabela[opcoes["painel"]] == nome], opcoes)
+        if nome in opcoes.get("linhas_v", {}):
+            plt.axvline(opcoes["linhas_v"][nome], color="gray", linestyle="--")
+        eixo.set_title(nome, fontsize=10)
+        eixo.set_xlabel(opcoes.get("xlabel_painel", ""))
+        if i == 1:
+            eixo.set_ylabel(opcoes.get("ylabel_painel", ""))
+            if opcoes.get("legenda_painel"):
+                eixo.legend()
+
+
+def _barras(dados, opcoes):
+    # Paleta por categoria do eixo x (hue = x, sem legenda)
+    sns.barplot(data=dados["tabela"], x=opcoes["x"], y=opcoes["y"], hue=opcoes["x"],
+                palette=opcoes.get("palette"), legend=False)
+
+
+def _boxplot(dados, opcoes):
+    # Uma caixa por coluna da tabela
+    tabela = dados["tabela"]
+    plt.boxplot([tabela[c].dropna().values for c in tabela.columns])
+    plt.xticks(range(1, len(tabela.columns) + 1), list(tabela.columns))
+
+
+def _boxplot_grupos(dados, opcoes):
+    sns.boxplot(data=dados["tabela"], x=opcoes.get("x"), y=opcoes.get("y"))
+
+
+def _dispersao(dados, opcoes):
+    tabela = dados["tabela"]
+    sns.scatterplot(x=tabela[opcoes["x"]].values, y=tabela[opcoes["y"]].values)
+    if "linha_h" in opcoes:
+        plt.axhline(opcoes["linha_h"], color="red", linestyle="--")
+
+
+def _regressao(dados, opcoes):
+    # Um painel por item de "paineis", lado a lado
+    paineis = opcoes["paineis"]
+    for i, painel in enumerate(paineis, start=1):
+        if len(paineis) > 1:
+            plt.subplot(1, len(paineis), i)
+        sns.regplot(data=dados["tabela"], x=painel["x"], y=painel["y"],
+                    **{k: v for k, v in painel.items() if k not in ("x", "y", "titulo", "xlabel", "ylabel")})
+        if "titulo" in painel:
+            plt.title(painel["titulo"])
+        if "xlabel" in painel:
+            plt.xlabel(painel["xlabel"])
+        if "ylabel" in painel:
+            plt.ylabel(painel["ylabel"])
+
+
+def _pairplot(dados, opcoes):
+    plt.close()  # o pairplot cria a própria figura
+    sns.pairplot(dados["tabela"])
+
+
+def _heatmap(dados, opcoes):
+    sns.heatmap(dados["tabela"], annot=opcoes.get("annot", True), cmap=opcoes.get("cmap", "coolwarm"),
+                fmt=opcoes.get("fmt", ".2f"))
+
+
+def _clusters(dados, opcoes):
+    X = dados["X"]
+    plt.scatter(X[:, 0], X[:, 1], c=dados["labels"], cmap=opcoes.get("cmap", "viridis"), s=opcoes.get("s", 50))
+
+
+RENDERIZADORES = {
+    "linhas": _linhas,
+    "barras": _barras,
+    "boxplot": _boxplot,
+    "boxplot_grupos": _boxplot_grupos,
+    "dispersao": _dispersao,
+    "regressao": _regressao,
+    "pairplot": _pairplot,
+    "heatmap": _heatmap,
+    "clusters": _clusters,
+}
+
+
+def desenhar(spec):
+    opcoes = spec["opcoes"]
+    plt.figure(figsize=opcoes.get("figsize", (8, 5)))
+    RENDERIZADORES[spec["tipo"]](spec["dados"], opcoes)
+
+    # Acabamento comum a todos os tipos
+    if "titulo" in opcoes:
+        plt.title(opcoes["titulo"], fontsize=opcoes.get("fontsize_titulo"))
+    if "suptitulo" in opcoes:
+        plt.suptitle(opcoes["suptitulo"], y=opcoes.get("y_suptitulo", 0.98))
+    if "xlabel" in opcoes:
+        plt.xlabel(opcoes["xlabel"])
+    if "ylabel" in opcoes:
+        plt.ylabel(opcoes["ylabel"])
+    if "xticks" in opcoes:
+        plt.xticks(**opcoes["xticks"])
+    if opcoes.get("legenda"):
+        plt.legend()
+    if opcoes.get("grid"):
+        plt.grid(True)
+    plt.tight_layout()
+
+    os.makedirs(os.path.dirname(spec["caminho"]), exist_ok=True)
+    plt.savefig(spec["caminho"], dpi=opcoes.get("dpi", "figure"), bbox_inches=opcoes.get("bbox_inches"))
+    plt.close("all")
+
+
+def _renderizar_arquivo(caminho_spec):
+    with open(caminho_spec, "rb") as f:
+        spec = pickle.load(f)
+    desenhar(spec)
+    return spec["caminho"], spec["hash"]
+
+
+# === Etapa de renderização ===
+def renderizar_figuras(forcar=False, n_processos=N_PROCESSOS):
+    estado = {}
+    if os.path.exists(CAMINHO_ESTADO):
+        with open(CAMINHO_ESTADO, "r", encoding="utf-8") as f:
+            estado = json.load(f)
+
+    pendentes = []
+    total = 0
+    for nome in sorted(os.listdir(PASTA_SPECS)) if os.path.isdir(PASTA_SPECS) else []:
+        if not nome.endswith(".pkl"):
+            continue
+        total += 1
+        caminho_spec = os.path.join(PASTA_SPECS, nome)
+        with open(caminho_spec, "rb") as f:
+            spec = pickle.load(f)
+        atualizada = estado.get(spec["caminho"]) == spec["hash"] and os.path.exists(spec["caminho"])
+        if forcar or not atualizada:
+            pendentes.append(caminho_spec)
+
+    print(f"🖼️  {total} figuras registradas, {total - len(pendentes)} sem mudanças")
+    if not pendentes:
+        return
+
+    with ProcessPoolExecutor(max_workers=n_processos) as executor:
+        for caminho, hash_spec in executor.map(_renderizar_arquivo, pendentes):
+            estado[caminho] = hash_spec
+            print(f"   ✔ {os.path.relpath(caminho, RAIZ)}")
+
+            # Grava o estado a cada figura para não perder o progresso em caso de erro
+            with open(CAMINHO_ESTADO, "w", encoding="utf-8") as f:
+                json.dump(estado, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    renderizar_figuras(forcar="--forcar" in sys.argv)
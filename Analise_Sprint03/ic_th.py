@@ -1,86 +1,73 @@
-import pandas as pd
-import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LinearRegression
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.preprocessing import StandardScaler
-from sklearn.metrics import mean_squared_error
 from scipy.stats import ttest_rel
 import warnings
+import os
+import sys
 warnings.filterwarnings("ignore")
 
+# Carregamento compartilhado das planilhas (Analise_Sprint03/carregamento.py)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Analise_Sprint03.carregamento import carregar_grupo, GRUPOS_ANALISE, FEATURES, TARGET
+from Analise_Sprint03.bootstrap import bootstrap_rmse, bootstrap_rmse_lr, intervalo_confianca
+
 # === Configurações ===
-N_ITER = 1000  # Nº de iterações de bootstrap
+N_ITER = 1000  # Nº máximo de iterações de bootstrap
 TEST_SIZE = 0.3
 RANDOM_STATE = 42
+N_PROCESSOS = None  # None = todos os núcleos disponíveis
+TOLERANCIA_IC = 0.005  # Para antes de N_ITER se os limites do IC variarem menos que 0,5% entre rodadas
 
-# === Caminhos ===
-caminhos = {
-    "Alta Sensibilidade": "Divisao/planilha_alta.csv",
-    "Média Sensibilidade": "Divisao/planilha_media.csv",
-    "Baixa Sensibilidade": "Divisao/planilha_baixa.csv",
-    "Todas as Doenças": "Clustering/planilha/planilha_unificada_clusterizado.csv"
-}
-
-features = ["AREA_DESMATADA_KM2", "FRP", "RISCOFOGO", "PRECIPITACAO", "DIASEMCHUVA", "pm2.5_atm"]
-target = "OBITOS"
-
-# === Função para calcular RMSE com bootstrap ===
-def bootstrap_rmse(model, X, y, n_iter=N_ITER):
-    rmses = []
-    for _ in range(n_iter):
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=TEST_SIZE)
-        model.fit(X_train, y_train)
-        y_pred = model.predict(X_test)
-        rmse = np.sqrt(mean_squared_error(y_test, y_pred))
-        rmses.append(rmse)
-    return np.array(rmses)
+features = FEATURES
+target = TARGET
 
 # === Loop nos grupos ===
-for grupo, caminho in caminhos.items():
-    print(f"\n📊 Análise Estatística - {grupo}")
-    df = pd.read_csv(caminho)
-
-    # Preparo
-    df[target] = df[target].replace("-", np.nan)
-    for col in features + [target]:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
-
-    df = df[features + [target]].copy()
-    for col in features + [target]:
-        df[col] = df[col].fillna(df[col].median())
-
-    scaler = StandardScaler()
-    df[features] = scaler.fit_transform(df[features])
-
-    X = df[features]
-    y = df[target]
-
-    # === Gerar distribuições de RMSE ===
-    modelo_lr = LinearRegression()
-    modelo_rf = RandomForestRegressor(random_state=RANDOM_STATE)
-
-    rmse_lr = bootstrap_rmse(modelo_lr, X, y)
-    rmse_rf = bootstrap_rmse(modelo_rf, X, y)
-
-    # === Intervalos de Confiança 95% ===
-    ci_lr = np.percentile(rmse_lr, [2.5, 97.5])
-    ci_rf = np.percentile(rmse_rf, [2.5, 97.5])
-
-    print(f"\n📌 Intervalo de Confiança 95% (RMSE):")
-    print(f"Linear Regression: [{ci_lr[0]:.4f}, {ci_lr[1]:.4f}]")
-    print(f"Random Forest:     [{ci_rf[0]:.4f}, {ci_rf[1]:.4f}]")
-
-    # === Teste de Hipóteses (t de Student pareado) ===
-    stat, p_valor = ttest_rel(rmse_lr, rmse_rf)
-    print(f"\n🧪 Teste de Hipótese (LR vs RF):")
-    print(f"Estatística t = {stat:.4f}")
-    print(f"p-valor = {p_valor:.4f}")
-    
-    if p_valor < 0.05:
-        print("→ Diferença estatisticamente significativa (nível 5%)")
-    else:
-        print("→ Diferença **não** estatisticamente significativa (nível 5%)")
+# As iterações rodam em processos separados, por isso o script fica sob __main__
+if __name__ == "__main__":
+    for grupo in GRUPOS_ANALISE:
+        print(f"\n📊 Análise Estatística - {grupo}")
+
+        # Preparo (leitura tipada + imputação pela mediana)
+        df = carregar_grupo(grupo, preenchimento="mediana")
+        df = df[features + [target]].copy()
+
+        scaler = StandardScaler()
+        df[features] = scaler.fit_transform(df[features])
+
+        X = df[features]
+        y = df[target]
+
+        # === Gerar distribuições de RMSE ===
+        modelo_rf = RandomForestRegressor(random_state=RANDOM_STATE)
+
+        # Mesma semente base nos dois modelos → mesmas divisões treino/teste em cada iteração.
+        # A Regressão Linear é resolvida em lote (equações normais), sem refazer 1000 fits.
+        rmse_lr = bootstrap_rmse_lr(X, y, n_iter=N_ITER, test_size=TEST_SIZE, semente=RANDOM_STATE,
+                                    tolerancia=TOLERANCIA_IC)
+        rmse_rf = bootstrap_rmse(modelo_rf, X, y, n_iter=N_ITER, test_size=TEST_SIZE, semente=RANDOM_STATE,
+                                 n_processos=N_PROCESSOS, tolerancia=TOLERANCIA_IC)
+        print(f"Iterações de bootstrap: LR = {len(rmse_lr)}, RF = {len(rmse_rf)}")
+
+        # === Intervalos de Confiança 95% ===
+        ci_lr = intervalo_confianca(rmse_lr)
+        ci_rf = intervalo_confianca(rmse_rf)
+
+        print(f"\n📌 Intervalo de Confiança 95% (RMSE):")
+        print(f"Linear Regression: [{ci_lr[0]:.4f}, {ci_lr[1]:.4f}]")
+        print(f"Random Forest:     [{ci_rf[0]:.4f}, {ci_rf[1]:.4f}]")
+
+        # === Teste de Hipóteses (t de Student pareado) ===
+        # Pareia as iterações em comum (a convergência pode parar cada modelo em um ponto)
+        n_pares = min(len(rmse_lr), len(rmse_rf))
+        stat, p_valor = ttest_rel(rmse_lr[:n_pares], rmse_rf[:n_pares])
+        print(f"\n🧪 Teste de Hipótese (LR vs RF):")
+        print(f"Estatística t = {stat:.4f}")
+        print(f"p-valor = {p_valor:.4f}")
+
+        if p_valor < 0.05:
+            print("→ Diferença estatisticamente significativa (nível 5%)")
+        else:
+            print("→ Diferença **não** estatisticamente significativa (nível 5%)")
 
 
 # -----------------------------
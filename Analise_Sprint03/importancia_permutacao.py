@@ -0,0 +1,115 @@
+# -------------------------------------------------------------------------------------------
+# MOTOR DE IMPORTÂNCIA POR PERMUTAÇÃO (PARALELO E COM CACHE)
+#
+# Objetivo:
+# Complementar os coeficientes da regressão linear e o feature_importances_ (impureza) das
+# árvores com uma medida comparável entre modelos: quanto o RMSE piora quando os valores de
+# uma variável são embaralhados.
+#
+# Funcionamento:
+# - Cada modelo é ajustado uma única vez por grupo, e a previsão de base também é feita uma vez.
+#   Um modelo já ajustado (ex.: o mesmo de onde saem os coeficientes) é usado como está, sem
+#   novo ajuste, e as importâncias saem dessa mesma estimativa.
+# - Para cada variável, as N repetições de permutação são empilhadas em uma única matriz e
+#   previstas em uma chamada; as variáveis são avaliadas em paralelo (joblib, N_JOBS).
+# - Cada variável tem sua própria semente (SeedSequence), então o resultado não depende do
+#   número de processos.
+# - O resultado fica em cache (Analise_Sprint03/.cache_importancia), identificado pelo hash
+#   do modelo (classe e parâmetros; o modelo inteiro, se já ajustado), dos dados de
+#   treino/avaliação, das repetições e da semente. Com cache, nem o ajuste do modelo é refeito.
+# -------------------------------------------------------------------------------------------
+
+import json
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.exceptions import NotFittedError
+from sklearn.utils.validation import check_is_fitted
+
+PASTA_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache_importancia")
+N_JOBS = -1
+N_REPETICOES = 10
+
+
+def _rmse(y, y_pred):
+    return np.sqrt(np.mean((y - y_pred) ** 2, axis=-1))
+
+
+def esta_ajustado(modelo):
+    try:
+        check_is_fitted(modelo)
+        return True
+    except NotFittedError:
+        return False
+
+
+def _prever(modelo, X):
+    # Modelos ajustados com DataFrame esperam os mesmos nomes de colunas
+    if hasattr(modelo, "feature_names_in_"):
+        X = pd.DataFrame(X, columns=modelo.feature_names_in_)
+    return modelo.predict(X)
+
+
+def _permutar_variavel(modelo, X, y, j, n_repeticoes, semente):
+    # Empilha as n_repeticoes cópias de X com a coluna j embaralhada e prevê tudo de uma vez
+    rng = np.random.default_rng(semente)
+    n = len(X)
+    X_perm = np.tile(X, (n_repeticoes, 1))
+    for r in range(n_repeticoes):
+        X_perm[r * n:(r + 1) * n, j] = X[rng.permutation(n), j]
+    return _rmse(y, _prever(modelo, X_perm).reshape(n_repeticoes, n))
+
+
+def chave_cache(modelo, X_treino, y_treino, X_aval, y_aval, n_repeticoes, semente):
+    # Modelo já ajustado: o hash cobre o estado ajustado; senão, só classe e parâmetros
+    partes = [joblib.hash(modelo if esta_ajustado(modelo) else clone(modelo)), joblib.hash(X_treino), joblib.hash(y_treino),
+              joblib.hash(X_aval), joblib.hash(y_aval), n_repeticoes, semente]
+    return joblib.hash(partes)
+
+
+def importancia_permutacao(modelo, X_treino, y_treino, X_aval=None, y_aval=None, features=None,
+                           n_repeticoes=N_REPETICOES, semente=42, n_jobs=N_JOBS, usar_cache=True):
+    """Aumento do RMSE ao permutar cada variável; sem X_aval, avalia no próprio treino.
+
+    Se o modelo já estiver ajustado, ele é usado diretamente (X_treino/y_treino só entram no cache).
+    """
+    X_treino = np.asarray(X_treino, dtype=float)
+    y_treino = np.asarray(y_treino, dtype=float)
+    X_aval = X_treino if X_aval is None else np.asarray(X_aval, dtype=float)
+    y_aval = y_treino if y_aval is None else np.asarray(y_aval, dtype=float)
+    features = list(features) if features is not None else [f"x{j}" for j in range(X_treino.shape[1])]
+
+    caminho_cache = os.path.join(
+        PASTA_CACHE, f"{chave_cache(modelo, X_treino, y_treino, X_aval, y_aval, n_repeticoes, semente)}.json"
+    )
+    if usar_cache and os.path.exists(caminho_cache):
+        with open(caminho_cache, "r", encoding="utf-8") as f:
+            return pd.DataFrame(json.load(f))
+
+    # Um único ajuste (nenhum, se o modelo já vier ajustado) e uma única previsão de base
+    ajustado = modelo if esta_ajustado(modelo) else clone(modelo).fit(X_treino, y_treino)
+    rmse_base = _rmse(y_aval, _prever(ajustado, X_aval))
+
+    sementes = [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(semente).spawn(len(features))]
+    rmses = Parallel(n_jobs=n_jobs)(
+        delayed(_permutar_variavel)(ajustado, X_aval, y_aval, j, n_repeticoes, sementes[j])
+        for j in range(len(features))
+    )
+    aumentos = np.array(rmses) - rmse_base
+
+    resultado = pd.DataFrame({
+        "variavel": features,
+        "importancia": aumentos.mean(axis=1),
+        "desvio": aumentos.std(axis=1),
+        "RMSE_base": rmse_base,
+    }).sort_values("importancia", ascending=False).reset_index(drop=True)
+
+    if usar_cache:
+        os.makedirs(PASTA_CACHE, exist_ok=True)
+        with open(caminho_cache, "w", encoding="utf-8") as f:
+            json.dump(resultado.to_dict(orient="list"), f)
+    return resultado
@@ -0,0 +1,142 @@
+# -------------------------------------------------------------------------------------------
+# PAINEL COMPACTO (ANO, MÊS) × VARIÁVEIS E (ANO, MÊS) × CID
+#
+# Objetivo:
+# A planilha_unificada.csv repete os mesmos valores ambientais do mês (AREA_DESMATADA_KM2, FRP,
+# RISCOFOGO, PRECIPITACAO, DIASEMCHUVA, pm2.5_atm, QUALIDADE_AR_CLASSIFICADA) em todas as
+# linhas de CID daquele mês, e o Divisao/divisao.py ainda grava mais três cópias. Com mais
+# municípios e centenas de CIDs, essas colunas duplicadas dominam o uso de memória.
+#
+# Estrutura (dicionário devolvido por montar_painel):
+# - "periodos": (n_periodos, 2) com ano e mês, em ordem cronológica
+# - "ambiente": (n_periodos, n_features) com as FEATURES de cada mês, guardadas uma única vez
+# - "qualidade": (n_periodos,) código inteiro da QUALIDADE_AR_CLASSIFICADA ("classes_qualidade")
+# - "cids": nomes das categorias CID-10; cada CID é representado pelo índice nesta lista
+# - "obitos": (n_periodos, n_cids) com os óbitos (NaN onde a planilha tinha "-")
+# - "presente": (n_periodos, n_cids) indica as combinações que existem na planilha longa
+#
+# As matrizes de modelagem são montadas sob demanda (matriz_design): as linhas de ambiente são
+# replicadas por indexação (broadcast) só para as células pedidas, sem materializar a tabela longa.
+# -------------------------------------------------------------------------------------------
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(RAIZ)
+from Analise_Sprint03.carregamento import carregar_grupo, FEATURES, TARGET
+
+COLUNA_CID = "Categoria CID-10"
+COLUNA_QUALIDADE = "QUALIDADE_AR_CLASSIFICADA"
+CHAVE_PERIODO = ["ano", "mes"]
+
+
+def montar_painel(df=None):
+    """Painel compacto a partir da tabela longa (por padrão, a planilha_unificada.csv)."""
+    if df is None:
+        df = carregar_grupo("Unificada")
+
+    codigo_periodo, periodos = pd.MultiIndex.from_frame(df[CHAVE_PERIODO]).factorize(sort=True)
+    codigo_cid, cids = pd.factorize(df[COLUNA_CID], sort=True)
+    n_periodos, n_cids = len(periodos), len(cids)
+
+    if pd.Series(codigo_periodo * n_cids + codigo_cid).duplicated().any():
+        raise ValueError("A tabela tem mais de uma linha para o mesmo (ano, mês, CID)")
+
+    # Variáveis ambientais: uma linha por mês (a primeira ocorrência; conferido abaixo)
+    primeira = pd.Series(np.arange(len(df))).groupby(codigo_periodo).first().values
+    ambiente = df[FEATURES].to_numpy(dtype=float)[primeira]
+    reconstruido = ambiente[codigo_periodo]
+    iguais = (reconstruido == df[FEATURES].to_numpy(dtype=float)) | (np.isnan(reconstruido) & df[FEATURES].isna().values)
+    if not iguais.all():
+        raise ValueError("As variáveis ambientais variam entre CIDs do mesmo mês")
+
+    codigo_qualidade, classes_qualidade = pd.factorize(df[COLUNA_QUALIDADE])
+
+    obitos = np.full((n_periodos, n_cids), np.nan)
+    obitos[codigo_periodo, codigo_cid] = df[TARGET].to_numpy(dtype=float)
+    presente = np.zeros((n_periodos, n_cids), dtype=bool)
+    presente[codigo_periodo, codigo_cid] = True
+
+    return {
+        "periodos": np.column_stack([periodos.get_level_values(0), periodos.get_level_values(1)]).astype(np.int16),
+        "ambiente": ambiente,
+        "features": list(FEATURES),
+        "qualidade": codigo_qualidade[primeira].astype(np.int8),
+        "classes_qualidade": list(classes_qualidade),
+        "cids": list(cids),
+        "obitos": obitos,
+        "presente": presente,
+    }
+
+
+def indices_cids(painel, cids):
+    """Índices inteiros das categorias CID-10 (nome completo ou código como "J44")."""
+    posicao = {nome: i for i, nome in enumerate(painel["cids"])}
+    codigo = {nome.split()[0]: i for i, nome in enumerate(painel["cids"])}
+    indices = []
+    for cid in cids:
+        if cid in posicao:
+            indices.append(posicao[cid])
+        elif cid in codigo:
+            indices.append(codigo[cid])
+        else:
+            raise KeyError(f"CID não encontrado no painel: {cid}")
+    return np.array(indices, dtype=int)
+
+
+def celulas(painel, cids=None, apenas_com_obitos=False):
+    """Pares (índice do período, índice do CID) das células existentes, em ordem de período e CID."""
+    mascara = painel["presente"].copy()
+    if cids is not None:
+        selecionados = np.zeros(len(painel["cids"]), dtype=bool)
+        selecionados[indices_cids(painel, cids)] = True
+        mascara &= selecionados[None, :]
+    if apenas_com_obitos:
+        mascara &= ~np.isnan(painel["obitos"])
+    return np.nonzero(mascara)
+
+
+def matriz_design(painel, cids=None, features=None, apenas_com_obitos=False):
+    """X (células × features) e y (óbitos) montados por broadcast, mais os índices das células."""
+    features = painel["features"] if features is None else list(features)
+    colunas = [painel["features"].index(f) for f in features]
+
+    i_periodo, i_cid = celulas(painel, cids, apenas_com_obitos)
+    X = painel["ambiente"][np.ix_(i_periodo, colunas)]
+    y = painel["obitos"][i_periodo, i_cid]
+    return X, y, i_periodo, i_cid
+
+
+def para_tabela(painel, cids=None):
+    """Reconstrói a tabela longa (mesmas colunas da planilha_unificada.csv) para as células pedidas."""
+    i_periodo, i_cid = celulas(painel, cids)
+    df = pd.DataFrame({
+        "ano": painel["periodos"][i_periodo, 0].astype(np.int64),
+        COLUNA_CID: np.asarray(painel["cids"], dtype=object)[i_cid],
+        "mes": painel["periodos"][i_periodo, 1].astype(np.int64),
+        TARGET: painel["obitos"][i_periodo, i_cid],
+    })
+    df[painel["features"]] = painel["ambiente"][i_periodo]
+    df[COLUNA_QUALIDADE] = np.asarray(painel["classes_qualidade"], dtype=object)[painel["qualidade"][i_periodo]]
+    return df
+
+
+def memoria_painel(painel):
+    return sum(v.nbytes for v in painel.values() if isinstance(v, np.ndarray))
+
+
+if __name__ == "__main__":
+    df = carregar_grupo("Unificada")
+    painel = montar_painel(df)
+
+    n_periodos, n_cids = painel["obitos"].shape
+    print(f"📦 Painel: {n_periodos} meses × {len(painel['features'])} variáveis, {n_periodos} meses × {n_cids} CIDs")
+    print(f"   Tabela longa: {df.memory_usage(deep=True).sum() / 1024:.1f} KiB")
+    print(f"   Painel compacto: {memoria_painel(painel) / 1024:.1f} KiB")
+
+    X, y, _, _ = matriz_design(painel, apenas_com_obitos=True)
+    print(f"   Matriz de modelagem (células com óbitos): X {X.shape}, y {y.shape}")
@@ -1,4 +1,4 @@
-i# -------------------------------------------------------------------------------------------
+# -------------------------------------------------------------------------------------------
 # AVALIAÇÃO DO IMPACTO DO PRÉ-PROCESSAMENTO NOS MODELOS PREDITIVOS
 #
 # Objetivo:
@@ -30,20 +30,26 @@ from sklearn.ensemble import RandomForestRegressor
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import mean_squared_error, r2_score
 import warnings
+import os
+import sys
 
 warnings.filterwarnings("ignore")
 
-# Caminhos dos arquivos
-caminhos = {
-    "Alta Sensibilidade": "Divisao/planilha_alta.csv",
-    "Média Sensibilidade": "Divisao/planilha_media.csv",
-    "Baixa Sensibilidade": "Divisao/planilha_baixa.csv",
-    "Todas as Doenças (Clusterizado)": "Clustering/planilha/planilha_unificada_clusterizado.csv"
+# Carregamento compartilhado das planilhas (Analise_Sprint03/carregamento.py)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Analise_Sprint03.carregamento import carregar_grupo, FEATURES, TARGET
+
+# Grupos analisados (rótulo exibido → grupo do carregamento compartilhado)
+grupos = {
+    "Alta Sensibilidade": "Alta Sensibilidade",
+    "Média Sensibilidade": "Média Sensibilidade",
+    "Baixa Sensibilidade": "Baixa Sensibilidade",
+    "Todas as Doenças (Clusterizado)": "Todas as Doenças"
 }
 
 # Colunas numéricas e variável alvo
-features = ["AREA_DESMATADA_KM2", "FRP", "RISCOFOGO", "PRECIPITACAO", "DIASEMCHUVA", "pm2.5_atm"]
-target = "OBITOS"
+features = FEATURES
+target = TARGET
 
 # Função para avaliar o modelo
 def avaliar_modelo(X, y, modelo):
@@ -64,22 +70,12 @@ modelos = {
 resultados = []
 
 # Loop pelos grupos
-for grupo, caminho in caminhos.items():
-    df = pd.read_csv(caminho)
-
-    # Corrigir e converter colunas numéricas
-    df[target] = df[target].replace("-", np.nan)
-    for col in features + [target]:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
-
+for grupo, nome_grupo in grupos.items():
     # Criar base SEM pré-processamento
-    df_sem_pre = df[features + [target]].dropna()
+    df_sem_pre = carregar_grupo(nome_grupo)[features + [target]].dropna()
 
     # Criar base COM pré-processamento (imputação + normalização)
-    df_com_pre = df[features + [target]].copy()
-    for col in features + [target]:
-        mediana = df_com_pre[col].median()
-        df_com_pre[col] = df_com_pre[col].fillna(mediana)
+    df_com_pre = carregar_grupo(nome_grupo, preenchimento="mediana")[features + [target]].copy()
 
     scaler = StandardScaler()
     df_com_pre[features] = scaler.fit_transform(df_com_pre[features])
@@ -24,8 +24,8 @@
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
+import os
+import sys
 
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.model_selection import train_test_split
@@ -33,16 +33,20 @@ from sklearn.preprocessing import StandardScaler, PowerTransformer
 from sklearn.impute import KNNImputer
 from sklearn.metrics import mean_squared_error, r2_score
 
-# === Carrega a planilha ===
-df = pd.read_csv("Divisao/planilha_alta.csv")
+# Carregamento compartilhado das planilhas (Analise_Sprint03/carregamento.py)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Analise_Sprint03.carregamento import carregar_grupo, FEATURES, TARGET
+from Analise_Sprint03.figuras import emitir_figura
+
+# Figuras gravadas em Analise_Sprint03/imagens, qualquer que seja o diretório de execução
+PASTA_IMAGENS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "imagens")
 
 # === Define colunas relevantes ===
-features = ["AREA_DESMATADA_KM2", "FRP", "RISCOFOGO", "PRECIPITACAO", "DIASEMCHUVA", "pm2.5_atm"]
-target = "OBITOS"
+features = FEATURES
+target = TARGET
 
-# === Converte "-" em NaN e para valores numéricos ===
-for col in features + [target]:
-    df[col] = pd.to_numeric(df[col].replace("-", np.nan), errors="coerce")
+# === Carrega a planilha ("-" já convertido em NaN e colunas numéricas tipadas) ===
+df = carregar_grupo("Alta Sensibilidade")
 
 # === Remove linhas sem target ===
 df.dropna(subset=[target], inplace=True)
@@ -79,25 +83,21 @@ y_pred = modelo.predict(X_test)
 # === Cálculo dos resíduos ===
 residuos = y_test - y_pred
 
-# === Gráfico 1: Boxplot dos resíduos ===
-plt.figure(figsize=(6, 5))
-sns.boxplot(y=residuos)
-plt.title("Boxplot dos Resíduos (Random Forest - Alta)")
-plt.ylabel("Resíduos")
-plt.tight_layout()
-plt.savefig("boxplot_residuos_alta.png")
-plt.show()
-
-# === Gráfico 2: Dispersão dos resíduos ===
-plt.figure(figsize=(7, 5))
-sns.scatterplot(x=y_pred, y=residuos)
-plt.axhline(0, color='red', linestyle='--')
-plt.title("Dispersão dos Resíduos vs. Valores Preditos")
-plt.xlabel("Valores Preditos")
-plt.ylabel("Resíduos")
-plt.tight_layout()
-plt.savefig("dispersao_residuos_alta.png")
-plt.show()
+# === Gráficos (registrados para a etapa de renderização em figuras.py) ===
+tabela_residuos = pd.DataFrame({"previsto": y_pred, "residuo": residuos.values})
+
+# Gráfico 1: Boxplot dos resíduos
+emitir_figura(
+    os.path.join(PASTA_IMAGENS, "boxplot_residuos_alta.png"), "boxplot_grupos", {"tabela": tabela_residuos},
+    y="residuo", figsize=(6, 5), titulo="Boxplot dos Resíduos (Random Forest - Alta)", ylabel="Resíduos",
+)
+
+# Gráfico 2: Dispersão dos resíduos
+emitir_figura(
+    os.path.join(PASTA_IMAGENS, "dispersao_residuos_alta.png"), "dispersao", {"tabela": tabela_residuos},
+    x="previsto", y="residuo", linha_h=0, figsize=(7, 5),
+    titulo="Dispersão dos Resíduos vs. Valores Preditos", xlabel="Valores Preditos", ylabel="Resíduos",
+)
 
 # === Métricas ===
 rmse = np.sqrt(mean_squared_error(y_test, y_pred))
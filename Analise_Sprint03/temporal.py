@@ -17,10 +17,19 @@
 # - Conversão do campo "mês" para nome legível
 # - Agrupamento dos dados por mês (somando óbitos e fazendo média dos fatores ambientais)
 # - Geração de gráfico de linha comparando as curvas de óbitos e variáveis ambientais
+#   (registrado para a etapa de renderização em figuras.py)
 # -------------------------------------------------------------------------------------------
 
 import pandas as pd
-import matplotlib.pyplot as plt
+import os
+import sys
+
+# Figuras geradas pela etapa de renderização (Analise_Sprint03/figuras.py)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Analise_Sprint03.figuras import emitir_figura
+
+# Figuras gravadas em Analise_Sprint03/imagens, qualquer que seja o diretório de execução
+PASTA_IMAGENS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "imagens")
 
 # Lê a planilha
 df = pd.read_csv('Divisao/planilha_alta.csv')
@@ -54,20 +63,19 @@ ordem_meses = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun',
 df_agrupado['mes_nome'] = pd.Categorical(df_agrupado['mes_nome'], categories=ordem_meses, ordered=True)
 df_agrupado = df_agrupado.sort_values('mes_nome')
 
-# Cria o gráfico
-plt.figure(figsize=(12, 6))
-plt.plot(df_agrupado['mes_nome'], df_agrupado['OBITOS'], label='Óbitos (Alta Sensibilidade)', marker='o', linewidth=2)
-plt.plot(df_agrupado['mes_nome'], df_agrupado['FRP'], label='Queimadas (FRP)', linestyle='--')
-plt.plot(df_agrupado['mes_nome'], df_agrupado['AREA_DESMATADA_KM2'], label='Área Desmatada (km²)', linestyle='--')
-plt.plot(df_agrupado['mes_nome'], df_agrupado['DIASEMCHUVA'], label='Dias sem chuva', linestyle='--')
-plt.plot(df_agrupado['mes_nome'], df_agrupado['pm2.5_atm'], label='PM2.5 (µg/m³)', linestyle='--')
-
-# Personalização
-plt.title('Óbitos por Doenças Respiratórias de Alta Sensibilidade vs Indicadores Ambientais')
-plt.xlabel('Mês')
-plt.ylabel('Valores')
-plt.legend()
-plt.grid(True)
-plt.tight_layout()
-
-plt.show()
+# Registra o gráfico (desenhado em Analise_Sprint03/imagens/temporal_alta.png)
+emitir_figura(
+    os.path.join(PASTA_IMAGENS, "temporal_alta.png"), "linhas",
+    {"tabela": df_agrupado[["mes_nome", "OBITOS", "FRP", "AREA_DESMATADA_KM2", "DIASEMCHUVA", "pm2.5_atm"]]},
+    x="mes_nome",
+    series=[
+        {"y": "OBITOS", "label": "Óbitos (Alta Sensibilidade)", "marker": "o", "linewidth": 2},
+        {"y": "FRP", "label": "Queimadas (FRP)", "linestyle": "--"},
+        {"y": "AREA_DESMATADA_KM2", "label": "Área Desmatada (km²)", "linestyle": "--"},
+        {"y": "DIASEMCHUVA", "label": "Dias sem chuva", "linestyle": "--"},
+        {"y": "pm2.5_atm", "label": "PM2.5 (µg/m³)", "linestyle": "--"},
+    ],
+    figsize=(12, 6),
+    titulo="Óbitos por Doenças Respiratórias de Alta Sensibilidade vs Indicadores Ambientais",
+    xlabel="Mês", ylabel="Valores", legenda=True, grid=True,
+)
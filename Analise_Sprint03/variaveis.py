@@ -17,6 +17,8 @@
 # - Preenchimento de valores ausentes com a média.
 # - Ajuste de modelos Linear Regression e Random Forest.
 # - Exibição dos coeficientes (linear) e importâncias (floresta) para comparação.
+# - Importância por permutação dos dois modelos no conjunto de teste, comparável entre eles
+#   (motor paralelo e com cache em importancia_permutacao.py).
 # -------------------------------------------------------------------------------------------
 
 import pandas as pd
@@ -25,13 +27,20 @@ from sklearn.linear_model import LinearRegression
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.model_selection import train_test_split
 import warnings
+import os
+import sys
 warnings.filterwarnings("ignore")
 
+# Carregamento compartilhado das planilhas (Analise_Sprint03/carregamento.py)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Analise_Sprint03.carregamento import carregar_grupo, FEATURES, TARGET
+from Analise_Sprint03.importancia_permutacao import importancia_permutacao
+
 def analisar_variaveis(df, nome_tabela):
     print(f"\n🔍 ANÁLISE DE VARIÁVEIS - {nome_tabela}")
 
-    features = ["AREA_DESMATADA_KM2", "FRP", "RISCOFOGO", "PRECIPITACAO", "DIASEMCHUVA", "pm2.5_atm"]
-    target = "OBITOS"
+    features = FEATURES
+    target = TARGET
     
     X = df[features]
 
@@ -41,8 +50,8 @@ def analisar_variaveis(df, nome_tabela):
     y = y.fillna(y.mean())  # preenche os NaNs resultantes
 
 
-    # Separar em treino e teste (para consistência, mesmo que não use test)
-    X_train, _, y_train, _ = train_test_split(X, y, test_size=0.3, random_state=42)
+    # Separar em treino e teste (o teste é usado na importância por permutação)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.3, random_state=42)
 
     # Regressão Linear: Coeficientes
     modelo_lr = LinearRegression()
@@ -62,12 +71,19 @@ def analisar_variaveis(df, nome_tabela):
     for var, imp in sorted(zip(features, importancias_rf), key=lambda x: x[1], reverse=True):
         print(f"{var:20}: {imp:.4f}")
 
+    # Importância por permutação (aumento do RMSE no teste), com os mesmos modelos já ajustados
+    for nome_modelo, modelo in [("Regressão Linear", modelo_lr), ("Random Forest", modelo_rf)]:
+        importancias = importancia_permutacao(modelo, X_train, y_train, X_test, y_test, features=features)
+        print(f"\nImportância por Permutação ({nome_modelo}) - aumento do RMSE:")
+        for _, linha in importancias.iterrows():
+            print(f"{linha['variavel']:20}: {linha['importancia']:.4f} ± {linha['desvio']:.4f}")
+
 # Ler as tabelas
 tabelas = {
-    "Alta Sensibilidade": pd.read_csv("Divisao/planilha_alta.csv"),
-    "Média Sensibilidade": pd.read_csv("Divisao/planilha_media.csv"),
-    "Baixa Sensibilidade": pd.read_csv("Divisao/planilha_baixa.csv"),
-    "Unficada": pd.read_csv("planilha_unificada.csv",sep=";")
+    "Alta Sensibilidade": carregar_grupo("Alta Sensibilidade"),
+    "Média Sensibilidade": carregar_grupo("Média Sensibilidade"),
+    "Baixa Sensibilidade": carregar_grupo("Baixa Sensibilidade"),
+    "Unficada": carregar_grupo("Unificada")
 }
 
 # Analisar variáveis
@@ -30,15 +30,75 @@
 
 # ==============================================================
 
+# -------------------------------------------------------------------------------------------
+# MODOS DE EXECUÇÃO
+#
+# - Padrão (MODO_STREAMING = False): KMeans completo em memória, como sempre foi feito.
+# - Streaming (MODO_STREAMING = True): para tabelas que não cabem em memória. O CSV é lido em
+#   blocos de TAMANHO_CHUNK linhas e percorrido três vezes: (1) média/desvio do StandardScaler
+#   com partial_fit, (2) MiniBatchKMeans.partial_fit nos blocos padronizados, (3) rótulos de
+#   cada bloco gravados direto no CSV de saída. Só um bloco fica em memória por vez.
+#
+# Seleção de k (SELECIONAR_K = True):
+# Em vez de fixar K_FIXO clusters, cada k de CANDIDATOS_K é avaliado em paralelo (joblib) pela
+# inércia e pela silhueta em uma amostra de AMOSTRA_SILHUETA pontos; o k escolhido é o de
+# maior silhueta. Todos os candidatos usam a mesma matriz padronizada, gravada uma vez em
+# Clustering/.cache (.npy, identificada pelo hash do CSV) e aberta com memory-map pelos
+# processos. No modo streaming essa matriz é uma amostra de até AMOSTRA_K linhas da tabela.
+#
+# Atualização incremental (padrão quando já existe modelo salvo):
+# - Cada ajuste grava em Clustering/modelos/<tabela>.joblib o scaler, o modelo (centroides) e
+#   a inércia média por ponto dos dados de ajuste.
+# - Nas execuções seguintes, só as linhas novas da tabela (chave ano, mes, CID-10 ainda
+#   ausente no *_clusterizado.csv) são padronizadas com o scaler salvo, atribuídas ao centroide
+#   mais próximo e acrescentadas ao CSV; as linhas já existentes mantêm o cluster.
+# - Deriva = inércia média acumulada das linhas novas / inércia média do ajuste − 1. A tabela
+#   é reajustada do zero quando a deriva passa de LIMITE_DERIVA e também da faixa de ruído
+#   esperada para o tamanho do lote. Um limite fixo não serve para lotes pequenos: as
+#   variáveis ambientais são iguais em todas as linhas de um mês, então um lote de um mês é
+#   praticamente uma única observação, e meses do próprio ajuste já passavam do limite.
+#   A faixa de ruído é um bootstrap por mês: sorteiam-se N_BOOTSTRAP_DERIVA lotes com o mesmo
+#   nº de meses das linhas novas entre os meses do ajuste, e o limite é o quantil
+#   QUANTIL_DERIVA da deriva desses lotes.
+#   Os novos clusters são renumerados para casar com os centroides anteriores mais próximos,
+#   mantendo os rótulos estáveis.
+# - Linhas antigas editadas não são detectadas: use "--forcar" para reajustar tudo.
+# -------------------------------------------------------------------------------------------
+
 import pandas as pd
-from sklearn.cluster import KMeans
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.metrics import silhouette_score
 from sklearn.preprocessing import StandardScaler
-import matplotlib.pyplot as plt
+from scipy.optimize import linear_sum_assignment
+from joblib import Parallel, delayed
+import joblib
 import numpy as np
 import os
+import sys
+
+# Hash de conteúdo compartilhado com o cache colunar (base_dados/cache_colunar.py)
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "base_dados"))
+from cache_colunar import hash_arquivo
 
-# Cria a pasta Clustering se ela não existir
-os.makedirs("Clustering", exist_ok=True)
+# Figuras geradas pela etapa de renderização (Analise_Sprint03/figuras.py)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Analise_Sprint03.figuras import emitir_figura
+
+MODO_STREAMING = False
+TAMANHO_CHUNK = 100_000
+SELECIONAR_K = False
+K_FIXO = 3
+CANDIDATOS_K = range(2, 9)
+AMOSTRA_SILHUETA = 5_000
+AMOSTRA_K = 50_000
+N_JOBS = -1
+PASTA_CACHE = "Clustering/.cache"
+PASTA_MODELOS = "Clustering/modelos"
+PASTA_IMAGEM = os.path.join(os.path.dirname(os.path.abspath(__file__)), "imagem")
+LIMITE_DERIVA = 0.5
+N_BOOTSTRAP_DERIVA = 2000
+QUANTIL_DERIVA = 0.995
+CHAVES = ["ano", "mes", "Categoria CID-10"]
 
 # Arquivos a processar e seus separadores
 arquivos = {
@@ -54,49 +114,256 @@ colunas_numericas = [
     "RISCOFOGO", "PRECIPITACAO", "DIASEMCHUVA", "pm2.5_atm"
 ]
 
-for nome_arquivo, separador in arquivos.items():
-    print(f"\nClustering para: {nome_arquivo}")
-
-    try:
-        df = pd.read_csv(nome_arquivo, sep=separador)
-
-        # Substitui valores inválidos "-" por NaN
-        df[colunas_numericas] = df[colunas_numericas].replace("-", np.nan)
-        df[colunas_numericas] = df[colunas_numericas].apply(pd.to_numeric, errors='coerce')
-        df_limpo = df.dropna(subset=colunas_numericas)
-
-        # Padroniza os dados numéricos
-        scaler = StandardScaler()
-        X_scaled = scaler.fit_transform(df_limpo[colunas_numericas])
-
-        # Aplica o KMeans
-        kmeans = KMeans(n_clusters=3, random_state=42, n_init=10)
-        labels = kmeans.fit_predict(X_scaled)
-        df_saida = df_limpo.copy()
-        df_saida["Cluster"] = labels
-
-        # Define nome base do arquivo
-        base_nome = os.path.splitext(os.path.basename(nome_arquivo))[0]
-
-        # Salva o CSV com os clusters
-        caminho_csv = f"Clustering/planilha/{base_nome}_clusterizado.csv"
-        df_saida.to_csv(caminho_csv, index=False)
-        print(f"Planilha salva em: {caminho_csv}")
-
-        # Salva gráfico dos clusters
-        plt.figure(figsize=(6, 4))
-        plt.scatter(X_scaled[:, 0], X_scaled[:, 1], c=labels, cmap="viridis", s=50)
-        plt.title(f"Clusters - {base_nome}")
-        plt.xlabel(colunas_numericas[0])
-        plt.ylabel(colunas_numericas[1])
-        plt.grid(True)
-        plt.tight_layout()
-        caminho_img = f"Clustering/imagem/{base_nome}_clusters.png"
-        plt.savefig(caminho_img)
-        plt.close()
-        print(f"Gráfico salvo em: {caminho_img}")
-
-    except FileNotFoundError:
-        print(f"Arquivo não encontrado: {nome_arquivo}")
-    except Exception as e:
-        print(f"Erro ao processar {nome_arquivo}: {e}")
+
+def limpar(df):
+    # Substitui valores inválidos "-" por NaN
+    df[colunas_numericas] = df[colunas_numericas].replace("-", np.nan)
+    df[colunas_numericas] = df[colunas_numericas].apply(pd.to_numeric, errors='coerce')
+    return df.dropna(subset=colunas_numericas)
+
+
+def ler_blocos(nome_arquivo, separador):
+    for bloco in pd.read_csv(nome_arquivo, sep=separador, chunksize=TAMANHO_CHUNK):
+        bloco = limpar(bloco)
+        if len(bloco):
+            yield bloco
+
+
+# === Seleção de k ===
+def caminho_matriz(nome_arquivo):
+    base_nome = os.path.splitext(os.path.basename(nome_arquivo))[0]
+    modo = f"amostra{AMOSTRA_K}" if MODO_STREAMING else "completa"
+    return os.path.join(PASTA_CACHE, f"{base_nome}_{modo}_{hash_arquivo(nome_arquivo)[:16]}.npy")
+
+
+def _avaliar_k(caminho, k):
+    X = np.load(caminho, mmap_mode="r")
+    modelo = MiniBatchKMeans(n_clusters=k, random_state=42, n_init=3) if MODO_STREAMING else \
+        KMeans(n_clusters=k, random_state=42, n_init=10)
+    labels = modelo.fit_predict(X)
+    silhueta = silhouette_score(X, labels, sample_size=min(AMOSTRA_SILHUETA, len(X)), random_state=42)
+    return {"k": k, "inercia": modelo.inertia_, "silhueta": silhueta}
+
+
+def selecionar_k(caminho, candidatos=CANDIDATOS_K):
+    resultados = Parallel(n_jobs=N_JOBS)(delayed(_avaliar_k)(caminho, k) for k in candidatos)
+    tabela = pd.DataFrame(resultados)
+    print(tabela.round(4).to_string(index=False))
+    return int(tabela.loc[tabela["silhueta"].idxmax(), "k"])
+
+
+# === Clustering em memória ===
+def clusterizar_completo(nome_arquivo, separador, caminho_csv, anterior=None):
+    df = pd.read_csv(nome_arquivo, sep=separador)
+    df_limpo = limpar(df)
+
+    # Padroniza os dados numéricos
+    scaler = StandardScaler()
+    X_scaled = scaler.fit_transform(df_limpo[colunas_numericas].to_numpy(dtype=float))
+
+    k = K_FIXO
+    if SELECIONAR_K:
+        caminho = caminho_matriz(nome_arquivo)
+        if not os.path.exists(caminho):
+            np.save(caminho, X_scaled)
+        k = selecionar_k(caminho)
+        print(f"k escolhido: {k}")
+
+    # Aplica o KMeans
+    kmeans = KMeans(n_clusters=k, random_state=42, n_init=10)
+    labels = kmeans.fit_predict(X_scaled)
+    if anterior is not None:
+        labels = alinhar_rotulos(anterior, scaler, kmeans)[labels]
+    df_saida = df_limpo.copy()
+    df_saida["Cluster"] = labels
+
+    # Salva o CSV com os clusters
+    df_saida.to_csv(caminho_csv, index=False)
+    distancias = pd.Series(kmeans.transform(X_scaled).min(axis=1) ** 2, index=df_limpo.index)
+    por_mes = distancias.groupby(periodo(df_limpo)).agg(["sum", "size"])
+    return X_scaled, labels, {"scaler": scaler, "kmeans": kmeans, **referencia_deriva(por_mes)}
+
+
+# === Clustering em streaming (memória limitada a um bloco) ===
+def clusterizar_streaming(nome_arquivo, separador, caminho_csv, anterior=None):
+    rng = np.random.default_rng(42)
+
+    # Passo 1: estatísticas do scaler e amostra aleatória uniforme das linhas (reservoir)
+    # (cada linha recebe uma chave aleatória; ficam as AMOSTRA_K menores chaves vistas até agora)
+    scaler = StandardScaler()
+    amostra = np.empty((0, len(colunas_numericas)))
+    chaves = np.empty(0)
+    for bloco in ler_blocos(nome_arquivo, separador):
+        valores = bloco[colunas_numericas].to_numpy(dtype=float)
+        scaler.partial_fit(valores)
+        amostra = np.vstack([amostra, valores])
+        chaves = np.concatenate([chaves, rng.random(len(valores))])
+        if len(amostra) > AMOSTRA_K:
+            manter = np.argsort(chaves)[:AMOSTRA_K]
+            amostra, chaves = amostra[manter], chaves[manter]
+    amostra_scaled = scaler.transform(amostra)
+
+    k = K_FIXO
+    if SELECIONAR_K:
+        caminho = caminho_matriz(nome_arquivo)
+        if not os.path.exists(caminho):
+            np.save(caminho, amostra_scaled)
+        k = selecionar_k(caminho)
+        print(f"k escolhido: {k}")
+
+    # Passo 2: MiniBatchKMeans nos blocos padronizados
+    kmeans = MiniBatchKMeans(n_clusters=k, random_state=42, n_init=3, init_size=min(3 * k * 100, len(amostra_scaled)))
+    for bloco in ler_blocos(nome_arquivo, separador):
+        kmeans.partial_fit(scaler.transform(bloco[colunas_numericas].to_numpy(dtype=float)))
+    if anterior is not None:
+        alinhar_rotulos(anterior, scaler, kmeans)
+
+    # Passo 3: rótulos gravados bloco a bloco (e distâncias por mês, para a referência de deriva)
+    primeiro = True
+    por_mes = None
+    for bloco in ler_blocos(nome_arquivo, separador):
+        bloco = bloco.copy()
+        X_bloco = scaler.transform(bloco[colunas_numericas].to_numpy(dtype=float))
+        distancias = kmeans.transform(X_bloco)
+        bloco["Cluster"] = distancias.argmin(axis=1)
+        distancias = pd.Series(distancias.min(axis=1) ** 2, index=bloco.index)
+        bloco_mes = distancias.groupby(periodo(bloco)).agg(["sum", "size"])
+        por_mes = bloco_mes if por_mes is None else por_mes.add(bloco_mes, fill_value=0)
+        bloco.to_csv(caminho_csv, index=False, mode="w" if primeiro else "a", header=primeiro)
+        primeiro = False
+
+    # Gráfico feito sobre a amostra
+    return amostra_scaled, kmeans.predict(amostra_scaled), {
+        "scaler": scaler, "kmeans": kmeans, **referencia_deriva(por_mes)}
+
+
+# === Modelo salvo e atualização incremental ===
+def caminho_modelo(base_nome):
+    return os.path.join(PASTA_MODELOS, f"{base_nome}.joblib")
+
+
+def periodo(df):
+    # Mês contínuo (ano * 12 + mês): unidade do bootstrap de deriva
+    return (df["ano"].astype(int) * 12 + df["mes"].astype(int)).rename("periodo")
+
+
+def referencia_deriva(por_mes):
+    # Soma e nº de distâncias ao quadrado (ponto → centroide) de cada mês dos dados do ajuste
+    return {
+        "inercia_media": por_mes["sum"].sum() / por_mes["size"].sum(),
+        "dist_mes": por_mes["sum"].to_numpy(dtype=float),
+        "n_mes": por_mes["size"].to_numpy(dtype=float),
+    }
+
+
+def limite_deriva(modelo, n_meses):
+    """Deriva máxima aceita para linhas novas de n_meses meses: LIMITE_DERIVA ou o ruído do bootstrap."""
+    # Modelos salvos antes da referência por mês usam só o limite fixo
+    if "dist_mes" not in modelo:
+        return LIMITE_DERIVA
+    rng = np.random.default_rng(42)
+    sorteio = rng.integers(0, len(modelo["dist_mes"]), size=(N_BOOTSTRAP_DERIVA, n_meses))
+    derivas = modelo["dist_mes"][sorteio].sum(axis=1) / modelo["n_mes"][sorteio].sum(axis=1) / modelo["inercia_media"] - 1
+    return max(LIMITE_DERIVA, np.quantile(derivas, QUANTIL_DERIVA, method="higher"))
+
+
+def salvar_modelo(base_nome, modelo):
+    # Deriva acumulada zera a cada ajuste
+    os.makedirs(PASTA_MODELOS, exist_ok=True)
+    joblib.dump({**modelo, "soma_dist_novos": 0.0, "n_novos": 0, "meses_novos": []}, caminho_modelo(base_nome))
+
+
+def alinhar_rotulos(anterior, scaler, kmeans):
+    """Reordena os centroides de kmeans para casar com os do modelo anterior; devolve novo → anterior."""
+    novos = kmeans.cluster_centers_
+    if len(novos) != len(anterior["kmeans"].cluster_centers_):
+        return np.arange(len(novos))
+
+    # Centroides antigos levados para a escala do novo scaler
+    antigos = scaler.transform(anterior["scaler"].inverse_transform(anterior["kmeans"].cluster_centers_))
+    custo = ((novos[:, None, :] - antigos[None, :, :]) ** 2).sum(axis=2)
+    linhas, colunas = linear_sum_assignment(custo)
+    mapa = np.empty(len(novos), dtype=int)
+    mapa[linhas] = colunas
+
+    ordem = np.argsort(mapa)
+    kmeans.cluster_centers_ = novos[ordem]
+    return mapa
+
+
+def atribuir_novas(nome_arquivo, separador, caminho_csv, modelo):
+    """Acrescenta ao CSV as linhas novas; devolve o modelo atualizado ou None se a deriva pedir reajuste."""
+    # usecols mantém a ordem do arquivo; reordena para a ordem de CHAVES
+    existentes = pd.MultiIndex.from_frame(pd.read_csv(caminho_csv, usecols=CHAVES)[CHAVES])
+    colunas_saida = pd.read_csv(caminho_csv, nrows=0).columns
+
+    novas = []
+    for bloco in ler_blocos(nome_arquivo, separador):
+        novas.append(bloco[~pd.MultiIndex.from_frame(bloco[CHAVES]).isin(existentes)])
+    novas = pd.concat(novas) if novas else pd.DataFrame(columns=colunas_saida)
+    if novas.empty:
+        print("Sem linhas novas: clusters mantidos")
+        return modelo
+
+    X = modelo["scaler"].transform(novas[colunas_numericas].to_numpy(dtype=float))
+    distancias = modelo["kmeans"].transform(X) ** 2
+    soma_dist = modelo["soma_dist_novos"] + distancias.min(axis=1).sum()
+    n_novos = modelo["n_novos"] + len(X)
+    meses_novos = sorted(set(modelo.get("meses_novos", [])) | set(periodo(novas).tolist()))
+
+    deriva = (soma_dist / n_novos) / modelo["inercia_media"] - 1
+    limite = limite_deriva(modelo, len(meses_novos))
+    print(f"{len(novas)} linhas novas, deriva da inércia: {deriva:.2%} (limite {limite:.2%})")
+    # isclose: um lote igual ao pior mês do ajuste dá o próprio limite, a menos de arredondamento
+    if deriva > limite and not np.isclose(deriva, limite):
+        return None
+
+    novas = novas.copy()
+    novas["Cluster"] = distancias.argmin(axis=1)
+    novas.reindex(columns=colunas_saida).to_csv(caminho_csv, index=False, mode="a", header=False)
+    return {**modelo, "soma_dist_novos": soma_dist, "n_novos": n_novos, "meses_novos": meses_novos}
+
+
+if __name__ == "__main__":
+    # Cria as pastas de saída se elas não existirem
+    os.makedirs("Clustering", exist_ok=True)
+    os.makedirs(PASTA_CACHE, exist_ok=True)
+    forcar = "--forcar" in sys.argv
+
+    for nome_arquivo, separador in arquivos.items():
+        print(f"\nClustering para: {nome_arquivo}")
+
+        try:
+            # Define nome base do arquivo
+            base_nome = os.path.splitext(os.path.basename(nome_arquivo))[0]
+            caminho_csv = f"Clustering/planilha/{base_nome}_clusterizado.csv"
+
+            # Caminho rápido: só atribui as linhas novas aos clusters salvos
+            anterior = None
+            if os.path.exists(caminho_modelo(base_nome)) and os.path.exists(caminho_csv):
+                anterior = joblib.load(caminho_modelo(base_nome))
+                atualizado = None if forcar else atribuir_novas(nome_arquivo, separador, caminho_csv, anterior)
+                if atualizado is not None:
+                    joblib.dump(atualizado, caminho_modelo(base_nome))
+                    continue
+                print("Reajustando os clusters do zero")
+
+            if MODO_STREAMING:
+                X_scaled, labels, modelo = clusterizar_streaming(nome_arquivo, separador, caminho_csv, anterior)
+            else:
+                X_scaled, labels, modelo = clusterizar_completo(nome_arquivo, separador, caminho_csv, anterior)
+            salvar_modelo(base_nome, modelo)
+            print(f"Planilha salva em: {caminho_csv}")
+
+            # Registra o gráfico dos clusters (desenhado pela etapa de renderização)
+            caminho_img = os.path.join(PASTA_IMAGEM, f"{base_nome}_clusters.png")
+            emitir_figura(
+                caminho_img, "clusters", {"X": np.ascontiguousarray(X_scaled[:, :2]), "labels": labels},
+                figsize=(6, 4), titulo=f"Clusters - {base_nome}",
+                xlabel=colunas_numericas[0], ylabel=colunas_numericas[1], grid=True,
+            )
+
+        except FileNotFoundError:
+            print(f"Arquivo não encontrado: {nome_arquivo}")
+        except Exception as e:
+            print(f"Erro ao processar {nome_arquivo}: {e}")
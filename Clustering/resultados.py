@@ -1,11 +1,18 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
+import os
+import sys
 from sklearn.linear_model import LinearRegression
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import r2_score
 
+# Figuras geradas pela etapa de renderização (Analise_Sprint03/figuras.py)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Analise_Sprint03.figuras import emitir_figura
+
+# Figura gravada em Clustering/imagem, qualquer que seja o diretório de execução
+PASTA_IMAGEM = os.path.join(os.path.dirname(os.path.abspath(__file__)), "imagem")
+
 # Carregar base unificada com todas as doenças (inclui PM2.5 e FRP)
 df = pd.read_csv("Clustering/planilha/planilha_unificada_clusterizado.csv")
 
@@ -34,16 +41,13 @@ print(f"PM2.5_atm  → coef = {modelo.coef_[1]:.4f}")
 print(f"Intercepto → {modelo.intercept_:.4f}")
 print(f"R² do modelo: {r2:.4f}")
 
-# Gráficos de dispersão
-plt.figure(figsize=(12, 5))
-
-plt.subplot(1, 2, 1)
-sns.regplot(data=df, x='FRP', y='OBITOS', scatter_kws={'alpha':0.5})
-plt.title("Relação entre FRP e Óbitos")
-
-plt.subplot(1, 2, 2)
-sns.regplot(data=df, x='pm2.5_atm', y='OBITOS', scatter_kws={'alpha':0.5}, color='orange')
-plt.title("Relação entre PM2.5 e Óbitos")
-
-plt.tight_layout()
-plt.show()
+# Gráficos de dispersão (registrados para a etapa de renderização em Analise_Sprint03/figuras.py)
+emitir_figura(
+    os.path.join(PASTA_IMAGEM, "dispersao_frp_pm25_obitos.png"), "regressao", {"tabela": df},
+    paineis=[
+        {"x": "FRP", "y": "OBITOS", "scatter_kws": {"alpha": 0.5}, "titulo": "Relação entre FRP e Óbitos"},
+        {"x": "pm2.5_atm", "y": "OBITOS", "scatter_kws": {"alpha": 0.5}, "color": "orange",
+         "titulo": "Relação entre PM2.5 e Óbitos"},
+    ],
+    figsize=(12, 5),
+)
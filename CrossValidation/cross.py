@@ -14,93 +14,335 @@
 # Etapas realizadas:
 # - Leitura das planilhas de entrada com separadores diferentes.
 # - Limpeza e transformação das variáveis (incluindo codificação de variáveis categóricas).
-# - Aplicação de validação cruzada K-Fold (10 folds) para cálculo de RMSE e R² médios.
-# - Aplicação opcional do LOOCV (Leave-One-Out) quando a base possui ≤ 500 amostras.
+# - Aplicação de validação cruzada K-Fold (10 folds) para cálculo de RMSE, R² e MAE médios.
+#   Cada fold é ajustado uma única vez (todas as métricas saem das mesmas previsões) e os
+#   folds rodam em paralelo. As previsões fora do fold são salvas para a análise de resíduos.
+# - Aplicação do LOOCV (Leave-One-Out) em qualquer tamanho de base, sem refazer n ajustes:
+#     * modelos lineares → resíduos exatos pela identidade PRESS (e_i / (1 - h_ii));
+#     * Random Forest → previsões out-of-bag (cada amostra prevista pelas árvores que não a viram).
+#   Outros modelos usam o LOOCV tradicional (n ajustes), só quando a base possui ≤ 500 amostras.
+# - Validação temporal (CV_TEMPORAL): o K-Fold embaralhado treina com meses posteriores ao
+#   teste. Aqui cada corte (ano, mês) treina só com o passado e testa nos HORIZONTE meses
+#   seguintes, em janela expansiva (todo o histórico) ou rolante (últimos JANELA_ROLANTE meses):
+#     * regressão linear → estatísticas suficientes (X'X e X'y) acumuladas mês a mês uma única
+#       vez; cada corte só soma/subtrai meses e resolve um sistema pequeno, sem reajustar;
+#     * Random Forest → um ajuste independente por corte, cortes em paralelo.
+#   A imputação e a padronização usam só o treino de cada corte (sem vazamento do futuro).
 # - Geração automática de gráficos boxplot para visualização da dispersão das métricas.
 #
 # Observações:
-# - A métrica RMSE é invertida na função de scoring (por padrão do scikit-learn).
-# - A LOOCV é omitida em bases grandes por inviabilidade computacional.
+# - As métricas são calculadas diretamente das previsões (sem o sinal invertido do scoring).
+# - A LOOCV tradicional (refit) só é usada como alternativa para modelos sem forma fechada.
+# - No Random Forest, o OOB aproxima o LOOCV: cada árvore é treinada em uma amostra bootstrap,
+#   não em n - 1 pontos, mas nenhuma amostra participa da própria previsão.
 # -------------------------------------------------------------------------------------------
 
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import KFold, LeaveOneOut, cross_val_score
+from sklearn.model_selection import KFold, LeaveOneOut, cross_val_predict
 from sklearn.ensemble import RandomForestRegressor
-from sklearn.metrics import make_scorer, mean_squared_error
+from sklearn.linear_model import LinearRegression
+from sklearn.base import clone
+from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
+from joblib import Parallel, delayed
 from sklearn.preprocessing import StandardScaler
+from sklearn.pipeline import make_pipeline
 import warnings
-import matplotlib.pyplot as plt
+import os
+import sys
+
+# Carregamento compartilhado das planilhas (Analise_Sprint03/carregamento.py)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Analise_Sprint03.carregamento import carregar_grupo, GRUPOS, TARGET
+from Analise_Sprint03.figuras import emitir_figura
+
+# Saídas ficam em CrossValidation/, qualquer que seja o diretório de execução
+PASTA = os.path.dirname(os.path.abspath(__file__))
 
 # Função de erro RMSE
 def rmse(y_true, y_pred):
     return np.sqrt(mean_squared_error(y_true, y_pred))
 
-rmse_scorer = make_scorer(rmse, greater_is_better=False)
-
-arquivos = {
-    "Clustering/planilha/planilha_unificada_clusterizado.csv": ";",
-    "Divisao/planilha_alta.csv": ",",
-    "Divisao/planilha_media.csv": ",",
-    "Divisao/planilha_baixa.csv": ","
+# Métricas calculadas em cada fold a partir das mesmas previsões
+metricas = {
+    "RMSE": rmse,
+    "R²": r2_score,
+    "MAE": mean_absolute_error
 }
 
+# Nº de processos para os folds (-1 = todos os núcleos)
+N_JOBS = -1
+
+
+# Ajusta um fold e devolve suas previsões no conjunto de teste
+def _ajustar_fold(modelo, X, y, idx_treino, idx_teste):
+    modelo = clone(modelo).fit(X[idx_treino], y[idx_treino])
+    return idx_teste, modelo.predict(X[idx_teste])
+
+
+# Validação cruzada com um único ajuste por fold, folds em paralelo.
+# Retorna as métricas de cada fold e as previsões fora do fold de todas as amostras.
+def validacao_cruzada(modelo, X, y, cv, n_jobs=N_JOBS):
+    X = np.asarray(X)
+    y = np.asarray(y, dtype=float)
+    # cv pode ser um objeto do sklearn (com split) ou uma lista de (idx_treino, idx_teste)
+    divisoes = cv.split(X, y) if hasattr(cv, "split") else cv
+    folds = Parallel(n_jobs=n_jobs)(
+        delayed(_ajustar_fold)(modelo, X, y, idx_treino, idx_teste)
+        for idx_treino, idx_teste in divisoes
+    )
+
+    scores = {nome: [] for nome in metricas}
+    previsoes = np.full(len(y), np.nan)
+    fold_amostra = np.full(len(y), -1)
+    for i, (idx_teste, y_pred) in enumerate(folds):
+        previsoes[idx_teste] = y_pred
+        fold_amostra[idx_teste] = i
+        for nome, funcao in metricas.items():
+            scores[nome].append(funcao(y[idx_teste], y_pred))
+
+    scores = {nome: np.array(valores) for nome, valores in scores.items()}
+    return scores, previsoes, fold_amostra
+
+
+# Limite de amostras para o LOOCV tradicional (n ajustes), usado só sem forma fechada
+LIMITE_LOOCV_REFIT = 500
+
+
+# Resíduos leave-one-out exatos de uma regressão linear a partir de um único ajuste.
+# Identidade PRESS: e_loo_i = e_i / (1 - h_ii), com h_ii a diagonal da matriz chapéu.
+def residuos_loo_linear(modelo, X, y):
+    y = np.asarray(y, dtype=float)
+    modelo = clone(modelo).fit(X, y)
+    residuos = y - modelo.predict(X)
+
+    X_design = np.column_stack([np.ones(len(X)), X]) if modelo.fit_intercept else np.asarray(X)
+    # diag(H) = diag(X pinv(X)); a pseudo-inversa cobre colunas colineares (ex.: dummies)
+    h = np.einsum("ij,ji->i", X_design, np.linalg.pinv(X_design))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        residuos_loo = residuos / (1 - h)
+    # Pontos com alavancagem 1 não têm previsão leave-one-out definida
+    residuos_loo[np.isclose(h, 1)] = np.nan
+    return residuos_loo
+
+
+# Resíduos out-of-bag do Random Forest (aproximação do LOOCV com um único ajuste)
+def residuos_oob_floresta(modelo, X, y):
+    y = np.asarray(y, dtype=float)
+    modelo = clone(modelo).set_params(oob_score=True, bootstrap=True).fit(X, y)
+    return y - modelo.oob_prediction_
+
+
+# Escolhe a forma mais barata de obter os resíduos leave-one-out de cada modelo
+def residuos_loocv(modelo, X, y):
+    if isinstance(modelo, LinearRegression):
+        return residuos_loo_linear(modelo, X, y), "PRESS (exato)"
+    if isinstance(modelo, RandomForestRegressor):
+        return residuos_oob_floresta(modelo, X, y), "out-of-bag"
+    if len(y) <= LIMITE_LOOCV_REFIT:
+        y_pred = cross_val_predict(modelo, X, y, cv=LeaveOneOut())
+        return np.asarray(y, dtype=float) - y_pred, "refit"
+    return None, None
+
+# === Validação temporal (cortes por ano/mês) ===
+CV_TEMPORAL = True
+N_CORTES = 12          # nº de cortes: os últimos N_CORTES meses com dados viram teste
+HORIZONTE = 1          # meses previstos após cada corte
+JANELA_ROLANTE = 24    # meses de treino na janela rolante
+
+
+# Índice mensal contínuo (ano * 12 + mês), para que "24 meses" seja calendário e não linhas
+def indice_mensal(df):
+    return (df["ano"].astype(int) * 12 + df["mes"].astype(int) - 1).to_numpy()
+
+
+# Cortes temporais: treino com os meses anteriores ao corte, teste nos HORIZONTE meses seguintes.
+# janela=None → expansiva (todo o passado); janela=k → rolante (só os k meses antes do corte).
+# Devolve os cortes (mês do índice mensal) e a lista de (idx_treino, idx_teste).
+def divisoes_temporais(meses, n_cortes=N_CORTES, horizonte=HORIZONTE, janela=None):
+    cortes = np.unique(meses)[-n_cortes:]
+    divisoes = []
+    for corte in cortes:
+        inicio = -np.inf if janela is None else corte - janela
+        idx_treino = np.flatnonzero((meses >= inicio) & (meses < corte))
+        idx_teste = np.flatnonzero((meses >= corte) & (meses < corte + horizonte))
+        if len(idx_treino) and len(idx_teste):
+            divisoes.append((idx_treino, idx_teste))
+    return cortes, divisoes
+
+
+# Regressão linear em todos os cortes a partir de um único passe nos dados:
+# somas e produtos cruzados de cada mês são acumulados uma vez em prefixos, e o treino de um
+# corte (expansivo ou rolante) é a diferença entre dois prefixos. A solução usa a pseudo-inversa,
+# que cobre colunas colineares (ex.: dummies de um CID ainda sem óbitos no treino).
+# X chega sem imputação nem padronização: cada corte imputa NaN pela média do próprio treino e
+# padroniza com média/desvio do treino (SimpleImputer + StandardScaler ajustados no corte), sem
+# usar meses futuros. Com Z = X com NaN → 0 e M = indicadora de NaN, o X imputado é Z + M·diag(m),
+# então Z'Z, Z'M, M'M, Z'y e M'y acumulados bastam para montar o X'X de qualquer corte.
+# Resultado igual ao do LinearRegression ajustado em cada corte.
+def validacao_temporal_linear(X, y, meses, divisoes):
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y, dtype=float)
+    faltante = np.isnan(X)
+    com_faltante = np.flatnonzero(faltante.any(axis=0))
+    p, q = X.shape[1], len(com_faltante)
+    A = np.column_stack([np.ones(len(X)), np.where(faltante, 0.0, X), faltante[:, com_faltante]])
+
+    meses_unicos, posicao = np.unique(meses, return_inverse=True)
+    d = A.shape[1]
+    ata = np.zeros((len(meses_unicos) + 1, d, d))
+    aty = np.zeros((len(meses_unicos) + 1, d))
+    for i in range(len(meses_unicos)):
+        linhas = A[posicao == i]
+        ata[i + 1] = linhas.T @ linhas
+        aty[i + 1] = linhas.T @ y[posicao == i]
+    ata = np.cumsum(ata, axis=0)
+    aty = np.cumsum(aty, axis=0)
+
+    z, m = slice(1, p + 1), slice(p + 1, d)
+    folds = []
+    for idx_treino, idx_teste in divisoes:
+        # Os meses de treino são contíguos no índice mensal: [primeiro, último]
+        primeiro, ultimo = posicao[idx_treino].min(), posicao[idx_treino].max() + 1
+        g = ata[ultimo] - ata[primeiro]
+        h = aty[ultimo] - aty[primeiro]
+        n, soma_y = g[0, 0], h[0]
+
+        # Média de cada coluna nos valores observados do treino (0 se a coluna não tem nenhum)
+        n_faltantes = np.zeros(p)
+        n_faltantes[com_faltante] = g[0, m]
+        observados = n - n_faltantes
+        media = np.divide(g[0, z], observados, out=np.zeros(p), where=observados > 0)
+        media_f = media[com_faltante]
+
+        # X'X e X'y do treino imputado: Z + M·diag(média)
+        xtx = g[z, z].copy()
+        cruzado = g[z, m] * media_f
+        xtx[:, com_faltante] += cruzado
+        xtx[com_faltante, :] += cruzado.T
+        xtx[np.ix_(com_faltante, com_faltante)] += g[m, m] * np.outer(media_f, media_f)
+        xty = h[z].copy()
+        xty[com_faltante] += media_f * h[m]
+        soma_x = g[0, z] + n_faltantes * media
+
+        # Centraliza pelas médias do treino, como o LinearRegression: colunas constantes no
+        # treino (ex.: CID sem linhas) ficam com coeficiente 0 em vez de dividir o intercepto
+        sxx = xtx - np.outer(soma_x, soma_x) / n
+        sxy = xty - soma_x * soma_y / n
+
+        # Padronização pelo desvio do treino (desvio nulo → 1, como no StandardScaler)
+        desvio = np.sqrt(np.clip(np.diag(sxx), 0, None) / n)
+        desvio[desvio < 10 * np.finfo(float).eps * np.maximum(np.abs(soma_x / n), 1)] = 1.0
+        coeficientes = np.linalg.pinv(sxx / np.outer(desvio, desvio), rcond=1e-10, hermitian=True) @ (sxy / desvio)
+        coeficientes = coeficientes / desvio
+        intercepto = (soma_y - soma_x @ coeficientes) / n
+
+        X_teste = np.where(faltante[idx_teste], media, X[idx_teste])
+        folds.append((idx_teste, intercepto + X_teste @ coeficientes))
+    return folds
+
+
+# Métricas por corte e previsões, no mesmo formato da validacao_cruzada
+def metricas_folds(folds, y):
+    y = np.asarray(y, dtype=float)
+    scores = {nome: [] for nome in metricas}
+    previsoes = np.full(len(y), np.nan)
+    for idx_teste, y_pred in folds:
+        previsoes[idx_teste] = y_pred
+        for nome, funcao in metricas.items():
+            scores[nome].append(funcao(y[idx_teste], y_pred) if len(idx_teste) > 1 else np.nan)
+    return {nome: np.array(valores) for nome, valores in scores.items()}, previsoes
+
+grupos = ["Todas as Doenças", "Alta Sensibilidade", "Média Sensibilidade", "Baixa Sensibilidade"]
+
 model = RandomForestRegressor(random_state=42)
 
-for caminho, sep in arquivos.items():
+# Modelos avaliados no LOOCV
+modelos_loocv = {
+    "Random Forest": model,
+    "Regressão Linear": LinearRegression()
+}
+
+for grupo in grupos:
+    caminho = GRUPOS[grupo]["caminho"]
     print(f"\n📁 Avaliando: {caminho}")
 
     try:
-        df = pd.read_csv(caminho, sep=sep)
-
-        if 'OBITOS' not in df.columns:
-            print(f"⚠️  A coluna 'OBITOS' não foi encontrada no arquivo: {caminho}")
-            continue
-
-        # Limpeza e conversão
-        df = df[df['OBITOS'].apply(lambda x: str(x).replace(',', '.').replace('-', '').replace(' ', '').replace('.', '', 1).isdigit())]
-        df['OBITOS'] = df['OBITOS'].astype(float)
+        # Leitura tipada compartilhada; mantém apenas linhas com OBITOS numérico
+        df = carregar_grupo(grupo)
+        df = df.dropna(subset=[TARGET])
 
         y = df['OBITOS']
         X = df.drop(columns=['OBITOS'])
 
-        # Codificação e normalização
-        X = pd.get_dummies(X, drop_first=True)
-        X = StandardScaler().fit_transform(X)
+        meses = indice_mensal(df)
+
+        # Codificação e normalização (a validação temporal usa X_bruto e padroniza em cada corte)
+        X_bruto = pd.get_dummies(X, drop_first=True).to_numpy(dtype=float)
+        X = StandardScaler().fit_transform(X_bruto)
 
         # Validação cruzada K-Fold
         kf = KFold(n_splits=10, shuffle=True, random_state=42)
-        rmse_scores_kfold = cross_val_score(model, X, y, cv=kf, scoring=rmse_scorer)
-        r2_scores_kfold = cross_val_score(model, X, y, cv=kf, scoring='r2')
+        scores_kfold, previsoes_kfold, folds_kfold = validacao_cruzada(model, X, y, kf)
 
         print("🔁 K-Fold (10):")
-        print(f"   RMSE médio: {-np.mean(rmse_scores_kfold):.2f}")
-        print(f"   R² médio:   {np.mean(r2_scores_kfold):.3f}")
+        print(f"   RMSE médio: {np.mean(scores_kfold['RMSE']):.2f}")
+        print(f"   R² médio:   {np.mean(scores_kfold['R²']):.3f}")
+        print(f"   MAE médio:  {np.mean(scores_kfold['MAE']):.2f}")
 
-        # LOOCV com apenas RMSE
-        if len(df) <= 500:
-            loo = LeaveOneOut()
+        # Previsões fora do fold, para a análise de resíduos
+        nome_base = caminho.split("/")[-1].replace(".csv", "")
+        pd.DataFrame({
+            "fold": folds_kfold,
+            "OBITOS": y.values,
+            "OBITOS_previsto": previsoes_kfold,
+            "residuo": y.values - previsoes_kfold
+        }, index=df.index).to_csv(os.path.join(PASTA, f'validacao_{nome_base}_previsoes.csv'))
+
+        # LOOCV por forma fechada (linear) ou out-of-bag (Random Forest)
+        # Para a regressão linear, NaN restantes viram 0 (= média da coluna padronizada)
+        print("🔁 Leave-One-Out (LOOCV):")
+        for nome_modelo, modelo_loo in modelos_loocv.items():
+            X_loo = np.nan_to_num(X) if isinstance(modelo_loo, LinearRegression) else X
             with warnings.catch_warnings():
                 warnings.simplefilter("ignore")
-                rmse_scores_loo = cross_val_score(model, X, y, cv=loo, scoring=rmse_scorer)
-            print("🔁 Leave-One-Out (LOOCV):")
-            print(f"   RMSE médio: {-np.mean(rmse_scores_loo):.2f}")
-            print(f"   R² médio:   ⚠️ Não avaliado por ser indefinido no LOOCV")
-        else:
-            print("⚠️  LOOCV não executado devido ao tamanho da base.")
-
-        # Gráfico da validação cruzada
-        rmse_individual = -rmse_scores_kfold
-        r2_individual = r2_scores_kfold
-
-        plt.figure(figsize=(10, 5))
-        plt.boxplot([rmse_individual, r2_individual], labels=['RMSE', 'R²'])
-        plt.title(f'Validação Cruzada - {caminho.split("/")[-1]}')
-        plt.ylabel('Valor da Métrica')
-        plt.grid(True)
-        plt.tight_layout()
-        plt.savefig(f'validacao_{caminho.split("/")[-1].replace(".csv", "")}.png', dpi=300)
-        plt.show()
+                residuos_loo, metodo = residuos_loocv(modelo_loo, X_loo, y)
+
+            if residuos_loo is None:
+                print(f"   {nome_modelo}: ⚠️ LOOCV não executado devido ao tamanho da base.")
+                continue
+
+            # RMSE médio por amostra (como no cross_val_score com LeaveOneOut) e RMSE global;
+            # com as previsões de todas as amostras, o R² (Q²) passa a ser definido
+            validos = ~np.isnan(residuos_loo)
+            y_validos = np.asarray(y, dtype=float)[validos]
+            press = np.sum(residuos_loo[validos] ** 2)
+            q2 = 1 - press / np.sum((y_validos - y_validos.mean()) ** 2)
+            print(f"   {nome_modelo} ({metodo}):")
+            print(f"      RMSE médio:  {np.mean(np.abs(residuos_loo[validos])):.2f}")
+            print(f"      RMSE global: {np.sqrt(press / validos.sum()):.2f}")
+            print(f"      R² (Q²):     {q2:.3f}")
+
+        # Validação temporal: só o passado prevê o futuro (expansiva e rolante)
+        if CV_TEMPORAL:
+            print(f"🔁 Validação temporal ({N_CORTES} cortes, horizonte de {HORIZONTE} mês):")
+            # Padronização ajustada só no treino de cada corte (nada de média/desvio de meses futuros)
+            modelo_temporal = make_pipeline(StandardScaler(), model)
+            for nome_janela, janela in [("expansiva", None), (f"rolante {JANELA_ROLANTE}m", JANELA_ROLANTE)]:
+                _, divisoes = divisoes_temporais(meses, janela=janela)
+                scores_rf, _, _ = validacao_cruzada(modelo_temporal, X_bruto, y, divisoes)
+                scores_lr, _ = metricas_folds(validacao_temporal_linear(X_bruto, y, meses, divisoes), y)
+                for nome_modelo, scores in [("Random Forest", scores_rf), ("Regressão Linear", scores_lr)]:
+                    print(f"   {nome_modelo} | {nome_janela}: RMSE médio {np.nanmean(scores['RMSE']):.2f}"
+                          f" | MAE médio {np.nanmean(scores['MAE']):.2f}")
+
+        # Gráfico da validação cruzada (uma caixa por métrica, valores por fold),
+        # registrado para a etapa de renderização (Analise_Sprint03/figuras.py)
+        emitir_figura(
+            os.path.join(PASTA, f'validacao_{nome_base}.png'), "boxplot", {"tabela": pd.DataFrame(scores_kfold)},
+            figsize=(10, 5), titulo=f'Validação Cruzada - {caminho.split("/")[-1]}',
+            ylabel='Valor da Métrica', grid=True, dpi=300,
+        )
 
     except Exception as e:
         print(f"❌ Erro ao processar {caminho}: {e}")
@@ -26,40 +26,32 @@ for item in doencas:
         ini, fim = parse_faixa(entrada["cid"])
         faixas[categoria].append((ini, fim))
 
-# Funções auxiliares para processar o código CID e verificar se ele pertence a uma faixa
-def cid_para_int(cid):
-    return int(cid[1:])
+# Tabela de consulta compilada uma única vez a partir do doencas.json:
+# (letra + número do CID) -> sensibilidade. A ordem Alta, Média, Baixa é mantida,
+# então um CID presente em mais de uma faixa fica com a primeira, como antes.
+tabela_cid = {}
+for categoria in ["Alta", "Média", "Baixa"]:
+    for ini, fim in faixas[categoria]:
+        for valor in range(int(ini[1:]), int(fim[1:]) + 1):
+            tabela_cid.setdefault(f"{ini[0]}{valor}", categoria)
 
-def pertence_a_faixa(cid, lista_faixas):
-    try:
-        if not cid or not isinstance(cid, str) or len(cid) < 3:
-            return False
-        letra, valor = cid[0], cid_para_int(cid)
-        for ini, fim in lista_faixas:
-            if letra == ini[0] and cid_para_int(ini) <= valor <= cid_para_int(fim):
-                return True
-    except:
-        return False
-    return False
-
-# Classifica o CID puro em Alta, Média ou Baixa sensibilidade com base nas faixas definidas
-def classificar_cid(cid):
-    if pertence_a_faixa(cid, faixas["Alta"]):
-        return "Alta"
-    elif pertence_a_faixa(cid, faixas["Média"]):
-        return "Média"
-    elif pertence_a_faixa(cid, faixas["Baixa"]):
-        return "Baixa"
-    else:
-        return "Desconhecida"
+# Classifica uma coluna inteira de CIDs puros em Alta, Média ou Baixa sensibilidade.
+# Códigos vazios, curtos demais ou fora das faixas ficam como "Desconhecida".
+def classificar_cids(cids):
+    cids = cids.astype("string")
+    sufixo = cids.str[1:]
+    numero = pd.to_numeric(sufixo.where(sufixo.str.fullmatch(r"\d+")), errors="coerce").astype("Int64")
+    chave = cids.str[0] + numero.astype("string")
+    chave = chave.where(cids.str.len() >= 3)
+    return chave.map(tabela_cid).fillna("Desconhecida").astype(object)
 
 # Os CIDs na planilha original têm formato como "J44   Doença pulmonar obstrutiva crônica"
 # Aqui extraímos apenas o código CID (ex: "J44"), para poder aplicar a lógica de faixa
 df["CID_PURO"] = df["Categoria CID-10"].str.extract(r'^(J\d{2})')
 
-# Aplicamos a função de classificação com base no CID puro
+# Aplicamos a classificação com base no CID puro, em uma única passada vetorizada
 # Justificativa: a divisão permite análises mais específicas por grupo clínico e melhora o desempenho dos modelos
-df["Sensibilidade"] = df["CID_PURO"].apply(classificar_cid)
+df["Sensibilidade"] = classificar_cids(df["CID_PURO"])
 
 # Gera e salva arquivos CSV segmentados por sensibilidade
 # Justificativa: esses subconjuntos serão usados para criar modelos mais interpretáveis e eficazes para cada tipo de doença
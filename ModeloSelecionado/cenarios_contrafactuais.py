@@ -0,0 +1,134 @@
+# -------------------------------------------------------------------------------------------
+# MOTOR DE CENÁRIOS CONTRAFACTUAIS ("E SE O FRP / PM2.5 FOSSE X% MAIOR NA SECA?")
+#
+# Objetivo:
+# Avaliar de uma vez milhares de cenários de perturbação das variáveis ambientais sobre o
+# painel unificado (ano, mês, CID-10), usando os modelos finais já treinados
+# (ModeloSelecionado/modelos.py), sem editar scripts nem retreinar.
+#
+# Funcionamento:
+# - GRADE define, para cada uma das seis features, os fatores multiplicativos a testar
+#   (1.2 = +20%). Os cenários são o produto cartesiano desses fatores.
+#   Os faltantes são imputados (medianas do treino) antes da perturbação, então também variam.
+# - As perturbações são aplicadas só nos meses de MESES_CENARIO (por padrão, a estação seca);
+#   nos demais meses a previsão do cenário é igual à de base, e essas linhas nem são avaliadas.
+# - Para cada grupo de sensibilidade, as linhas do painel de todos os cenários são empilhadas
+#   em uma única matriz e previstas em poucas chamadas (lotes de até LINHAS_POR_LOTE linhas).
+# - Delta = óbitos previstos no cenário − óbitos previstos na base, somado por CID e mês.
+#
+# Saídas (ModeloSelecionado/resultados_cenarios):
+# - deltas_cid_mes.csv: um registro por cenário × CID × mês (somando os anos)
+# - resumo_cenarios.csv: delta total de cada cenário, do maior para o menor
+# -------------------------------------------------------------------------------------------
+
+import itertools
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(RAIZ)
+from Analise_Sprint03.carregamento import carregar_grupo, FEATURES
+from ModeloSelecionado.modelos import grupo_por_cid, matriz_features, prever_matriz, COLUNA_CID
+
+PASTA_SAIDA = os.path.join(RAIZ, "ModeloSelecionado", "resultados_cenarios")
+
+# === Configuração dos cenários ===
+GRADE = {
+    "AREA_DESMATADA_KM2": [1.0, 1.2],
+    "FRP": [0.8, 0.9, 1.0, 1.1, 1.2, 1.5],
+    "RISCOFOGO": [0.9, 1.0, 1.1],
+    "PRECIPITACAO": [0.8, 1.0, 1.2],
+    "DIASEMCHUVA": [1.0, 1.2],
+    "pm2.5_atm": [0.8, 0.9, 1.0, 1.1, 1.2, 1.5],
+}
+MESES_CENARIO = [7, 8, 9, 10, 11]  # estação seca em Manaus; None = todos os meses
+LIMITES = {"RISCOFOGO": (0.0, 1.0)}  # faixa válida após a perturbação
+LINHAS_POR_LOTE = 500_000
+
+
+def montar_cenarios(grade):
+    """Matriz (n_cenarios, 6) de fatores, na ordem de FEATURES."""
+    fatores = [grade.get(f, [1.0]) for f in FEATURES]
+    return np.array(list(itertools.product(*fatores)), dtype=float)
+
+
+def aplicar_cenarios(X, cenarios):
+    # (n, 6) × (S, 6) → (S, n, 6) e respeita os limites de cada feature
+    X_cen = X[None, :, :] * cenarios[:, None, :]
+    for feature, (minimo, maximo) in LIMITES.items():
+        j = FEATURES.index(feature)
+        X_cen[..., j] = np.clip(X_cen[..., j], minimo, maximo)
+    return X_cen
+
+
+def deltas_grupo(X, cenarios, grupo):
+    """Delta de óbitos previstos (S, n) de cada cenário para as linhas X de um grupo."""
+    base = prever_matriz(X, grupo)
+    n = len(X)
+    cenarios_por_lote = max(1, LINHAS_POR_LOTE // max(n, 1))
+
+    deltas = np.empty((len(cenarios), n))
+    for inicio in range(0, len(cenarios), cenarios_por_lote):
+        lote = cenarios[inicio:inicio + cenarios_por_lote]
+        previsto = prever_matriz(aplicar_cenarios(X, lote).reshape(-1, X.shape[1]), grupo)
+        deltas[inicio:inicio + len(lote)] = previsto.reshape(len(lote), n) - base
+    return deltas
+
+
+def avaliar_cenarios(painel, cenarios, meses=MESES_CENARIO):
+    """Deltas somados por cenário × (CID, mês): devolve a matriz (S, n_chaves) e as chaves (CID, mês)."""
+    if meses is not None:
+        painel = painel[painel["mes"].isin(meses)]
+    painel = painel.reset_index(drop=True)
+
+    # Índice de cada linha no agrupamento final (CID, mês); a indicadora linha → (CID, mês) é
+    # esparsa (um 1 por linha), então a memória cresce com o nº de linhas e não com linhas × chaves
+    codigo_grupo, chaves = pd.MultiIndex.from_frame(painel[[COLUNA_CID, "mes"]]).factorize(sort=True)
+    indicadora = csr_matrix(
+        (np.ones(len(painel)), (np.arange(len(painel)), codigo_grupo)), shape=(len(painel), len(chaves))
+    )
+
+    total = np.zeros((len(cenarios), len(chaves)))
+    sensibilidade = grupo_por_cid(painel[COLUNA_CID])
+    for grupo, posicoes in sensibilidade.groupby(sensibilidade.values).indices.items():
+        X = matriz_features(painel.iloc[posicoes], grupo)
+        # (S, n) @ (n, K) feito como (K, n) @ (n, S) para usar o produto esparso × denso
+        total += (indicadora[posicoes].T @ deltas_grupo(X, cenarios, grupo).T).T
+        print(f"   ✔ {grupo}: {len(posicoes)} linhas × {len(cenarios)} cenários")
+
+    return total, chaves
+
+
+def tabela_resultados(total, chaves, cenarios):
+    n_cen, n_chaves = total.shape
+    df = pd.DataFrame({
+        "cenario": np.repeat(np.arange(n_cen), n_chaves),
+        COLUNA_CID: np.tile(chaves.get_level_values(0), n_cen),
+        "mes": np.tile(chaves.get_level_values(1), n_cen),
+        "DELTA_OBITOS": total.ravel(),
+    })
+    fatores = pd.DataFrame(cenarios, columns=[f"fator_{f}" for f in FEATURES])
+    fatores.insert(0, "cenario", np.arange(n_cen))
+
+    resumo = fatores.assign(DELTA_OBITOS=total.sum(axis=1)).sort_values("DELTA_OBITOS", ascending=False)
+    return df.merge(fatores, on="cenario"), resumo
+
+
+if __name__ == "__main__":
+    painel = carregar_grupo("Unificada")
+    cenarios = montar_cenarios(GRADE)
+    print(f"🧪 {len(cenarios)} cenários sobre {len(painel)} linhas do painel (meses: {MESES_CENARIO or 'todos'})")
+
+    total, chaves = avaliar_cenarios(painel, cenarios)
+    deltas, resumo = tabela_resultados(total, chaves, cenarios)
+
+    os.makedirs(PASTA_SAIDA, exist_ok=True)
+    deltas.to_csv(os.path.join(PASTA_SAIDA, "deltas_cid_mes.csv"), index=False)
+    resumo.to_csv(os.path.join(PASTA_SAIDA, "resumo_cenarios.csv"), index=False)
+
+    print(resumo.head(10).to_string(index=False))
+    print(f"✅ Resultados salvos em: {PASTA_SAIDA}")
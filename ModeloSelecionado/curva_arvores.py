@@ -0,0 +1,124 @@
+# -------------------------------------------------------------------------------------------
+# CURVA DE ERRO × NÚMERO DE ÁRVORES DO RANDOM FOREST (WARM START)
+#
+# Objetivo:
+# Verificar se as 100 árvores padrão (RandomForestRegressor(random_state=42)) são necessárias
+# ou se uma floresta menor dá o mesmo RMSE, e recomendar um n_estimators por grupo.
+#
+# Funcionamento:
+# - Para cada grupo, uma única floresta cresce com warm_start=True até cada ponto de
+#   CHECKPOINTS; só as árvores novas são treinadas a cada passo.
+# - Em cada checkpoint são registrados o RMSE no conjunto de validação (30%) e o RMSE OOB
+#   (out-of-bag) no treino. As previsões de validação e OOB são acumuladas árvore a árvore,
+#   então as árvores antigas não são reavaliadas.
+# - A cobertura OOB é a fração do treino que ficou fora da amostra bootstrap de pelo menos
+#   uma árvore; o RMSE OOB usa só essas amostras. (O oob_prediction_ do sklearn devolve 0,
+#   e não NaN, para amostras sem previsão OOB, por isso a contagem é feita aqui.)
+# - Recomendação: menor n_estimators cujo RMSE OOB fica a até TOLERANCIA (relativa) do
+#   menor RMSE OOB da curva (entre os checkpoints em que todo o treino já tem previsão OOB).
+#
+# Saídas (ModeloSelecionado): curva_arvores.csv e curva_arvores.png (desenhada pela etapa de
+# renderização de figuras, Analise_Sprint03/figuras.py)
+# -------------------------------------------------------------------------------------------
+
+import os
+import sys
+import warnings
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+
+warnings.filterwarnings("ignore")
+
+# Carregamento compartilhado das planilhas (Analise_Sprint03/carregamento.py)
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(RAIZ)
+from Analise_Sprint03.carregamento import carregar_grupo, GRUPOS_ANALISE, FEATURES, TARGET
+from Analise_Sprint03.figuras import emitir_figura
+
+PASTA = os.path.join(RAIZ, "ModeloSelecionado")
+CHECKPOINTS = [10, 20, 30, 50, 75, 100, 150, 200, 300]
+TOLERANCIA = 0.01
+
+
+def curva_arvores(X_train, y_train, X_val, y_val, checkpoints=CHECKPOINTS, random_state=42):
+    """RMSE de validação e OOB a cada checkpoint de uma única floresta crescente."""
+    modelo = RandomForestRegressor(warm_start=True, random_state=random_state)
+    soma_val = np.zeros(len(y_val))
+    soma_oob = np.zeros(len(y_train))
+    n_oob = np.zeros(len(y_train), dtype=int)
+    linhas = []
+
+    for n_arvores in checkpoints:
+        n_antes = len(getattr(modelo, "estimators_", []))
+        modelo.set_params(n_estimators=n_arvores)
+        modelo.fit(X_train, y_train)
+
+        # Acumula só as árvores novas; a média das árvores é a previsão da floresta
+        novas = zip(modelo.estimators_[n_antes:], modelo.estimators_samples_[n_antes:])
+        for arvore, amostra in novas:
+            soma_val += arvore.predict(X_val)
+
+            # Amostras fora do bootstrap desta árvore (complemento das sorteadas no ajuste)
+            fora = np.setdiff1d(np.arange(len(y_train)), amostra)
+            soma_oob[fora] += arvore.predict(X_train[fora])
+            n_oob[fora] += 1
+        rmse_val = np.sqrt(np.mean((y_val - soma_val / n_arvores) ** 2))
+
+        # Com poucas árvores algumas amostras ainda não têm previsão OOB
+        validas = n_oob > 0
+        rmse_oob = np.sqrt(np.mean((y_train[validas] - soma_oob[validas] / n_oob[validas]) ** 2))
+
+        linhas.append({
+            "n_estimators": n_arvores, "RMSE_validacao": rmse_val, "RMSE_OOB": rmse_oob,
+            "cobertura_OOB": validas.mean(),
+        })
+
+    return pd.DataFrame(linhas)
+
+
+def recomendar_n_estimators(curva, tolerancia=TOLERANCIA):
+    # Só considera checkpoints em que todas as amostras de treino já têm previsão OOB
+    completa = curva[curva["cobertura_OOB"] == 1]
+    if completa.empty:
+        completa = curva
+    limite = completa["RMSE_OOB"].min() * (1 + tolerancia)
+    return int(completa.loc[completa["RMSE_OOB"] <= limite, "n_estimators"].min())
+
+
+if __name__ == "__main__":
+    curvas = []
+    recomendacoes = {}
+    for grupo in GRUPOS_ANALISE:
+        df = carregar_grupo(grupo, preenchimento="mediana")
+        X = StandardScaler().fit_transform(df[FEATURES].to_numpy(dtype=float))
+        y = df[TARGET].to_numpy(dtype=float)
+        X_train, X_val, y_train, y_val = train_test_split(X, y, test_size=0.3, random_state=42)
+
+        curva = curva_arvores(X_train, y_train, X_val, y_val)
+        recomendacoes[grupo] = recomendar_n_estimators(curva)
+        curvas.append(curva.assign(grupo=grupo))
+        print(f"🌲 {grupo}: n_estimators recomendado = {recomendacoes[grupo]}")
+        print(curva.round(4).to_string(index=False))
+
+    df_curvas = pd.concat(curvas, ignore_index=True)
+    df_curvas = df_curvas[["grupo", "n_estimators", "RMSE_validacao", "RMSE_OOB", "cobertura_OOB"]]
+    df_curvas["recomendado"] = df_curvas["n_estimators"] == df_curvas["grupo"].map(recomendacoes)
+    df_curvas.to_csv(os.path.join(PASTA, "curva_arvores.csv"), index=False)
+
+    # === Gráfico (registrado para a etapa de renderização em Analise_Sprint03/figuras.py) ===
+    emitir_figura(
+        os.path.join(PASTA, "curva_arvores.png"), "linhas", {"tabela": df_curvas},
+        x="n_estimators", painel="grupo",
+        series=[
+            {"y": "RMSE_validacao", "marker": "o", "label": "Validação"},
+            {"y": "RMSE_OOB", "marker": "s", "label": "OOB"},
+        ],
+        linhas_v=recomendacoes, xlabel_painel="n_estimators", ylabel_painel="RMSE", legenda_painel=True,
+        figsize=(16, 4), suptitulo="RMSE × número de árvores do Random Forest (warm start)",
+    )
+
+    print("✅ Curvas salvas em ModeloSelecionado/curva_arvores.csv")
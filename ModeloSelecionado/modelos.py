@@ -0,0 +1,176 @@
+# -------------------------------------------------------------------------------------------
+# MODELOS FINAIS PERSISTIDOS E PREVISÃO EM LOTE
+#
+# Objetivo:
+# Treinar uma única vez o modelo escolhido (Random Forest com pré-processamento: imputação pela
+# mediana + StandardScaler, ver resultados.txt) para cada grupo de sensibilidade, salvar os
+# artefatos em disco e oferecer uma previsão vetorizada para tabelas grandes, sem retreino.
+#
+# Artefatos (ModeloSelecionado/artefatos):
+# - <grupo>.joblib: modelo, scaler, lista de features e medianas usadas na imputação.
+#   Salvos sem compressão, para que os arrays numpy do artefato possam ser carregados com
+#   memory-map (mmap_mode="r"), sem cópia na leitura. Cada modelo é carregado uma vez por processo.
+# - manifesto.json: features, nº de amostras, hash dos dados de treino e versão do sklearn.
+#
+# Uso:
+#   python ModeloSelecionado/modelos.py                 → treina e salva os modelos
+#   python ModeloSelecionado/modelos.py entrada.csv     → prevê OBITOS para a tabela
+#       (colunas: ano, mes, Categoria CID-10 e as variáveis ambientais; separador detectado)
+# -------------------------------------------------------------------------------------------
+
+import hashlib
+import json
+import os
+import sys
+from functools import lru_cache
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.preprocessing import StandardScaler
+
+# Carregamento compartilhado das planilhas (Analise_Sprint03/carregamento.py)
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(RAIZ)
+from Analise_Sprint03.carregamento import carregar_grupo, GRUPOS_ANALISE, FEATURES, TARGET
+
+PASTA_ARTEFATOS = os.path.join(RAIZ, "ModeloSelecionado", "artefatos")
+CAMINHO_DOENCAS = os.path.join(RAIZ, "Divisao", "doencas.json")
+COLUNA_CID = "Categoria CID-10"
+
+# Nome do arquivo de cada grupo
+ARQUIVOS_MODELO = {
+    "Alta Sensibilidade": "alta",
+    "Média Sensibilidade": "media",
+    "Baixa Sensibilidade": "baixa",
+    "Todas as Doenças": "todas",
+}
+
+# Grupo usado quando o CID não pertence a nenhuma faixa do doencas.json
+GRUPO_PADRAO = "Todas as Doenças"
+
+
+def caminho_modelo(grupo):
+    return os.path.join(PASTA_ARTEFATOS, f"{ARQUIVOS_MODELO[grupo]}.joblib")
+
+
+# === Treinamento ===
+def treinar_modelo(grupo):
+    df = carregar_grupo(grupo, preenchimento="mediana")
+    medianas = carregar_grupo(grupo)[FEATURES].median()
+
+    scaler = StandardScaler()
+    X = scaler.fit_transform(df[FEATURES].to_numpy(dtype=float))
+    y = df[TARGET].values
+
+    modelo = RandomForestRegressor(random_state=42)
+    modelo.fit(X, y)
+
+    hash_treino = hashlib.sha1(pd.util.hash_pandas_object(df[FEATURES + [TARGET]], index=False).values.tobytes())
+    artefato = {
+        "modelo": modelo,
+        "scaler": scaler,
+        "features": list(FEATURES),
+        "medianas": medianas.values.astype(float),
+    }
+    info = {"n_amostras": int(len(df)), "hash_dados": hash_treino.hexdigest()}
+    return artefato, info
+
+
+def salvar_modelos(grupos=GRUPOS_ANALISE):
+    os.makedirs(PASTA_ARTEFATOS, exist_ok=True)
+    manifesto = {"features": list(FEATURES), "sklearn": sklearn.__version__, "grupos": {}}
+
+    for grupo in grupos:
+        artefato, info = treinar_modelo(grupo)
+        # Sem compressão: permite carregar com mmap_mode="r"
+        joblib.dump(artefato, caminho_modelo(grupo), compress=0)
+        manifesto["grupos"][grupo] = {"arquivo": os.path.basename(caminho_modelo(grupo)), **info}
+        print(f"💾 Modelo salvo: {grupo} → {caminho_modelo(grupo)}")
+
+    with open(os.path.join(PASTA_ARTEFATOS, "manifesto.json"), "w", encoding="utf-8") as f:
+        json.dump(manifesto, f, indent=2, ensure_ascii=False)
+    carregar_modelo.cache_clear()
+
+
+# === Carregamento ===
+@lru_cache(maxsize=None)
+def carregar_modelo(grupo):
+    caminho = caminho_modelo(grupo)
+    if not os.path.exists(caminho):
+        raise FileNotFoundError(
+            f"Modelo de '{grupo}' não encontrado em {caminho}. Rode ModeloSelecionado/modelos.py para treinar."
+        )
+    return joblib.load(caminho, mmap_mode="r")
+
+
+@lru_cache(maxsize=None)
+def tabela_sensibilidade():
+    # CID (letra + número) → grupo de sensibilidade, a partir das faixas do doencas.json
+    with open(CAMINHO_DOENCAS, "r", encoding="utf-8") as f:
+        doencas = json.load(f)
+
+    tabela = {}
+    for item in doencas:
+        grupo = item["categoria"]  # ex.: "Alta Sensibilidade"
+        for entrada in item["dados"]:
+            ini, fim = entrada["cid"].replace("–", "-").split("-")
+            for valor in range(int(ini[1:]), int(fim[1:]) + 1):
+                tabela.setdefault(f"{ini[0]}{valor}", grupo)
+    return tabela
+
+
+def grupo_por_cid(categorias_cid):
+    # "J44   Doença pulmonar..." → "J44" → grupo; CIDs fora das faixas vão para GRUPO_PADRAO
+    codigo = categorias_cid.astype("string").str.extract(r"^([A-Z])(\d{2})")
+    chave = codigo[0] + codigo[1].astype("Int64").astype("string")
+    return chave.map(tabela_sensibilidade()).fillna(GRUPO_PADRAO).astype(object)
+
+
+# === Previsão em lote ===
+def matriz_features(df, grupo):
+    """Matriz (n, 6) das features de df, com faltantes imputados pelas medianas do treino do grupo."""
+    artefato = carregar_modelo(grupo)
+    X = df[artefato["features"]].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+
+    faltantes = np.isnan(X)
+    if faltantes.any():
+        X = np.where(faltantes, artefato["medianas"], X)
+    return X
+
+
+def prever_matriz(X, grupo):
+    # X já imputado, nas unidades originais (antes do scaler)
+    artefato = carregar_modelo(grupo)
+    return artefato["modelo"].predict(artefato["scaler"].transform(X))
+
+
+def prever_grupo(df, grupo):
+    """Previsão de OBITOS para todas as linhas de df com o modelo de um grupo (uma chamada)."""
+    return prever_matriz(matriz_features(df, grupo), grupo)
+
+
+def prever(df, grupo=None):
+    """Previsão em lote; sem grupo, cada linha usa o modelo da sensibilidade do seu CID."""
+    if grupo is not None:
+        return pd.Series(prever_grupo(df, grupo), index=df.index, name="OBITOS_PREVISTO")
+
+    grupos = grupo_por_cid(df[COLUNA_CID])
+    previsoes = np.empty(len(df))
+    for nome_grupo, posicoes in grupos.groupby(grupos.values).indices.items():
+        previsoes[posicoes] = prever_grupo(df.iloc[posicoes], nome_grupo)
+    return pd.Series(previsoes, index=df.index, name="OBITOS_PREVISTO")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        caminho_entrada = sys.argv[1]
+        df = pd.read_csv(caminho_entrada, sep=None, engine="python")
+        df["OBITOS_PREVISTO"] = prever(df)
+        caminho_saida = os.path.splitext(caminho_entrada)[0] + "_previsto.csv"
+        df.to_csv(caminho_saida, index=False)
+        print(f"✅ Previsões salvas em: {caminho_saida}")
+    else:
+        salvar_modelos()
@@ -0,0 +1,208 @@
+# -------------------------------------------------------------------------------------------
+# PIPELINE INCREMENTAL DE UNIFICAÇÃO (substitui as células do planilha_unificada.ipynb)
+#
+# Objetivo:
+# Gerar a planilha_unificada.csv a partir das planilhas intermediárias, executando apenas
+# as etapas cujos dados de entrada mudaram desde a última execução.
+#
+# Etapas (cada uma lê e grava CSVs, como no notebook):
+#   1. desmatamento  → concatena as estimativas mensais de Manaus por ano
+#   2. cid10         → mortalidade em formato longo + queimadas por mês + desmatamento
+#   3. pm25          → junta a média mensal de PM2.5 dos sensores
+#   4. qualidade_ar  → classifica a qualidade do ar e grava a planilha_unificada.csv
+#
+# Funcionamento:
+# - O arquivo .pipeline_estado.json guarda o hash (sha1) das entradas e saídas de cada etapa.
+# - Uma etapa é refeita se alguma entrada mudou, se alguma saída sumiu ou foi editada.
+# - Se uma etapa refeita gerar exatamente a mesma saída, as etapas seguintes não rodam.
+# - Use "--forcar" na linha de comando para refazer todas as etapas.
+# -------------------------------------------------------------------------------------------
+
+import glob
+import json
+import os
+import sys
+
+import pandas as pd
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+RAIZ = os.path.dirname(PASTA)
+
+# Hash de conteúdo compartilhado com o cache colunar (base_dados/cache_colunar.py)
+sys.path.append(os.path.join(RAIZ, "base_dados"))
+from cache_colunar import hash_arquivo
+
+CAMINHO_ESTADO = os.path.join(PASTA, ".pipeline_estado.json")
+
+
+def caminho(nome):
+    return os.path.join(PASTA, nome)
+
+
+# === Etapa 1: desmatamento ===
+def etapa_desmatamento(entradas, saidas):
+    # Leitura com round-trip dos floats: o parser padrão do pandas pode perder o último dígito e
+    # regravar a planilha versionada com ruído (ex.: 0.07072459566081273 → 0.0707245956608127).
+    # As demais etapas mantêm o parser padrão, com o qual as planilhas seguintes foram geradas.
+    dfs = [pd.read_csv(arquivo, float_precision="round_trip") for arquivo in sorted(entradas)]
+    df = pd.concat(dfs, ignore_index=True).sort_values(["ANO", "MES"])
+    df.to_csv(saidas[0], sep=";", index=False)
+
+
+# === Etapa 2: mortalidade + queimadas + desmatamento ===
+def etapa_cid10(entradas, saidas):
+    caminho_desmatamento, caminho_mortalidade, caminho_queimadas = entradas
+
+    # 1. Carregar os dados
+    df_desmatamento = pd.read_csv(caminho_desmatamento, sep=';')
+    df_mortalidade = pd.read_csv(caminho_mortalidade)
+    df_queimadas = pd.read_csv(caminho_queimadas)
+
+    # 2. Padronizar nomes
+    df_desmatamento.columns = ['ANO', 'MES', 'AREA_DESMATADA_KM2']
+    df_queimadas.columns = df_queimadas.columns.str.upper()
+
+    # 3. Transformar mortalidade para formato longo (mantendo CID-10)
+    meses_map = {
+        'Janeiro': 1, 'Fevereiro': 2, 'Março': 3, 'Abril': 4, 'Maio': 5, 'Junho': 6,
+        'Julho': 7, 'Agosto': 8, 'Setembro': 9, 'Outubro': 10, 'Novembro': 11, 'Dezembro': 12
+    }
+    df_mortalidade_long = df_mortalidade.melt(
+        id_vars=['ANO', 'Categoria CID-10'],
+        var_name='MES', value_name='OBITOS'
+    )
+    df_mortalidade_long['MES'] = df_mortalidade_long['MES'].map(meses_map)
+
+    # 4. Agregar queimadas por ano/mês
+    df_queimadas['MES'] = df_queimadas['MES'].astype(int)
+    df_queimadas_agg = df_queimadas.groupby(['ANO', 'MES'], as_index=False).agg({
+        'FRP': 'mean',
+        'RISCOFOGO': 'mean',
+        'PRECIPITACAO': 'mean',
+        'DIASEMCHUVA': 'mean'
+    })
+
+    # 5. Juntar dados de desmatamento e queimadas (por ano/mês)
+    df_ambiente = pd.merge(df_desmatamento, df_queimadas_agg, on=['ANO', 'MES'], how='outer')
+
+    # 6. Unir com a base de mortalidade (mantendo CID-10 separadamente)
+    df_final = pd.merge(df_mortalidade_long, df_ambiente, on=['ANO', 'MES'], how='left')
+
+    # 7. Salvar resultado
+    df_final = df_final.sort_values(by=['ANO', 'MES', 'Categoria CID-10'])
+    df_final.to_csv(saidas[0], sep=';', index=False)
+
+
+# === Etapa 3: PM2.5 ===
+def etapa_pm25(entradas, saidas):
+    caminho_cid10, caminho_ar = entradas
+    df_cid10 = pd.read_csv(caminho_cid10, sep=";")
+    df_ar = pd.read_csv(caminho_ar, sep=";")
+
+    # Garante consistência dos nomes
+    df_cid10 = df_cid10.rename(columns={"ANO": "ano", "MES": "mes"})
+
+    # Mantém apenas as colunas essenciais (ano, mes, pm2.5_atm)
+    df_ar = df_ar[["ano", "mes", "pm2.5_atm"]]
+
+    # Faz o merge por ano e mês
+    df_merged = pd.merge(df_cid10, df_ar, on=["ano", "mes"], how="left")
+    df_merged.to_csv(saidas[0], sep=";", index=False)
+
+
+# === Etapa 4: classificação da qualidade do ar ===
+def classificar_qualidade_ar(pm25):
+    if pd.isna(pm25):
+        return "Sem dados"
+    elif pm25 <= 12.0:
+        return "Boa"
+    elif pm25 <= 35.4:
+        return "Moderada"
+    elif pm25 <= 55.4:
+        return "Ruim"
+    elif pm25 <= 150.4:
+        return "Muito Ruim"
+    elif pm25 <= 250.4:
+        return "Péssima"
+    else:
+        return "Perigosa"
+
+
+def etapa_qualidade_ar(entradas, saidas):
+    df = pd.read_csv(entradas[0], sep=";")
+    df["QUALIDADE_AR_CLASSIFICADA"] = df["pm2.5_atm"].apply(classificar_qualidade_ar)
+    df.to_csv(saidas[0], sep=";", index=False)
+
+
+# Definição das etapas, na ordem de execução: nome, entradas, saídas e função
+etapas = [
+    {
+        "nome": "desmatamento",
+        "entradas": sorted(glob.glob(os.path.join(RAIZ, "base_dados", "desmatamento", "estimativa_manaus_mensal_*.csv"))),
+        "saidas": [caminho("estimativa_manaus_mensal.csv")],
+        "funcao": etapa_desmatamento,
+    },
+    {
+        "nome": "cid10",
+        "entradas": [caminho("estimativa_manaus_mensal.csv"), caminho("mortalidade_unificada.csv"),
+                     caminho("queimadas_unificadas.csv")],
+        "saidas": [caminho("dados_unificados_com_cid10.csv")],
+        "funcao": etapa_cid10,
+    },
+    {
+        "nome": "pm25",
+        "entradas": [caminho("dados_unificados_com_cid10.csv"), caminho("media_mensal_qualidade_ar_manaus.csv")],
+        "saidas": [caminho("dados_unificados_com_pm25.csv")],
+        "funcao": etapa_pm25,
+    },
+    {
+        "nome": "qualidade_ar",
+        "entradas": [caminho("dados_unificados_com_pm25.csv")],
+        "saidas": [os.path.join(RAIZ, "planilha_unificada.csv")],
+        "funcao": etapa_qualidade_ar,
+    },
+]
+
+
+def hashes(arquivos):
+    return {os.path.relpath(a, RAIZ): hash_arquivo(a) if os.path.exists(a) else None for a in arquivos}
+
+
+def executar(etapas, forcar=False):
+    estado = {}
+    if os.path.exists(CAMINHO_ESTADO):
+        with open(CAMINHO_ESTADO, "r", encoding="utf-8") as f:
+            estado = json.load(f)
+
+    for etapa in etapas:
+        nome = etapa["nome"]
+        hash_entradas = hashes(etapa["entradas"])
+        hash_saidas = hashes(etapa["saidas"])
+
+        faltando = [a for a, h in hash_entradas.items() if h is None]
+        if faltando:
+            raise FileNotFoundError(f"Etapa '{nome}': entradas não encontradas: {faltando}")
+
+        anterior = estado.get(nome, {})
+        atualizada = (
+            not forcar
+            and anterior.get("entradas") == hash_entradas
+            and anterior.get("saidas") == hash_saidas
+        )
+        if atualizada:
+            print(f"⏭️  {nome}: sem mudanças, etapa reaproveitada")
+            continue
+
+        print(f"🔄 {nome}: executando")
+        etapa["funcao"](etapa["entradas"], etapa["saidas"])
+        estado[nome] = {"entradas": hash_entradas, "saidas": hashes(etapa["saidas"])}
+
+        # Grava o estado a cada etapa para não perder o progresso em caso de erro
+        with open(CAMINHO_ESTADO, "w", encoding="utf-8") as f:
+            json.dump(estado, f, indent=2, ensure_ascii=False)
+
+    print("✅ Planilha unificada atualizada!")
+
+
+if __name__ == "__main__":
+    executar(etapas, forcar="--forcar" in sys.argv)
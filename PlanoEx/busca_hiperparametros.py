@@ -0,0 +1,148 @@
+# -------------------------------------------------------------------------------------------
+# BUSCA DE HIPERPARÂMETROS POR SUCCESSIVE HALVING (RANDOM FOREST E XGBOOST)
+#
+# Objetivo:
+# Os notebooks de Treinamento comparam os modelos só com os hiperparâmetros padrão, e um
+# grid search completo nos quatro grupos é caro demais para rodar a cada atualização dos dados.
+# Aqui cada família de modelo é ajustada por grupo com HalvingRandomSearchCV:
+# - todas as N_CANDIDATOS configurações começam com poucas árvores (MIN_ARVORES);
+# - a cada rodada só o melhor 1/FATOR segue, com FATOR vezes mais árvores (até MAX_ARVORES);
+# - as configurações de cada rodada são avaliadas em paralelo (N_JOBS) com KFold no treino.
+#
+# Dados: mesmo pré-processamento do plano de experimentação (preparar_grupo, alvo log_OBITOS)
+# e a mesma divisão treino/teste 70/30. O XGBoost é opcional: sem o pacote, só o RF é buscado.
+#
+# Saída: PlanoEx/Excel/busca_hiperparametros_<grupo>.xlsx, com as TOP_N melhores
+# configurações de cada modelo, da que chegou mais longe na busca para a que caiu antes
+# (RMSE da validação cruzada na última rodada alcançada e RMSE/R² no teste).
+# -------------------------------------------------------------------------------------------
+
+import os
+import sys
+import warnings
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401 (habilita o HalvingRandomSearchCV)
+from sklearn.metrics import mean_squared_error, r2_score
+from sklearn.model_selection import HalvingRandomSearchCV, KFold, train_test_split
+
+try:
+    from xgboost import XGBRegressor
+except ImportError:
+    XGBRegressor = None
+
+warnings.filterwarnings("ignore")
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from PlanoEx.plano_experimentacao import PLANO, PASTA_EXCEL, preparar_grupo
+
+# === Configuração da busca ===
+N_CANDIDATOS = 81
+FATOR = 3
+MIN_ARVORES = 10
+MAX_ARVORES = 270
+N_FOLDS = 5
+N_JOBS = -1
+TOP_N = 5
+
+ESPACOS = {
+    "RandomForest": {
+        "max_depth": [None, 3, 5, 8, 12],
+        "min_samples_split": [2, 5, 10],
+        "min_samples_leaf": [1, 2, 4, 8],
+        "max_features": [1.0, 0.5, "sqrt"],
+    },
+    "XGBoost": {
+        "max_depth": [2, 3, 4, 6],
+        "learning_rate": [0.03, 0.1, 0.3],
+        "subsample": [0.7, 1.0],
+        "colsample_bytree": [0.7, 1.0],
+        "min_child_weight": [1, 5],
+        "reg_lambda": [1, 5],
+    },
+}
+
+
+def modelos_base():
+    modelos = {"RandomForest": RandomForestRegressor(random_state=42)}
+    if XGBRegressor is not None:
+        modelos["XGBoost"] = XGBRegressor(random_state=42, n_jobs=1)
+    else:
+        print("⚠️  xgboost não instalado: busca apenas do RandomForest")
+    return modelos
+
+
+def buscar(modelo, espaco, X_train, y_train, random_state=42):
+    busca = HalvingRandomSearchCV(
+        modelo, espaco,
+        n_candidates=N_CANDIDATOS,
+        factor=FATOR,
+        resource="n_estimators",
+        min_resources=MIN_ARVORES,
+        max_resources=MAX_ARVORES,
+        aggressive_elimination=True,
+        cv=KFold(n_splits=N_FOLDS, shuffle=True, random_state=random_state),
+        scoring="neg_root_mean_squared_error",
+        refit=False,
+        n_jobs=N_JOBS,
+        random_state=random_state,
+    )
+    return busca.fit(X_train, y_train)
+
+
+def classificacao(busca, modelo, X_train, X_test, y_train, y_test, top_n=TOP_N):
+    # Cada configuração entra com a última rodada que alcançou; quem foi mais longe vem primeiro
+    cv = pd.DataFrame(busca.cv_results_)
+    cv["config"] = cv["params"].apply(lambda p: str({k: v for k, v in p.items() if k != "n_estimators"}))
+    final = (
+        cv.sort_values(["iter", "mean_test_score"], ascending=False)
+        .drop_duplicates("config")
+        .head(top_n)
+    )
+
+    linhas = []
+    for _, linha in final.iterrows():
+        params = {**linha["params"], "n_estimators": int(linha["n_resources"])}
+        ajustado = clone(modelo).set_params(**params).fit(X_train, y_train)
+        y_pred = ajustado.predict(X_test)
+        linhas.append({
+            "n_estimators": params["n_estimators"],
+            "Parametros": linha["config"],
+            "RMSE_CV": round(-linha["mean_test_score"], 4),
+            "RMSE_Teste": round(np.sqrt(mean_squared_error(y_test, y_pred)), 4),
+            "R2_Teste": round(r2_score(y_test, y_pred), 4),
+        })
+    return pd.DataFrame(linhas)
+
+
+def buscar_grupo(grupo, modelos, plano=PLANO):
+    X, y = preparar_grupo(grupo)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=plano["test_size"], random_state=plano["random_state"]
+    )
+
+    tabelas = []
+    for nome, modelo in modelos.items():
+        busca = buscar(modelo, ESPACOS[nome], X_train, y_train, random_state=plano["random_state"])
+        tabela = classificacao(busca, modelo, X_train, X_test, y_train, y_test)
+        tabela.insert(0, "Posicao", np.arange(1, len(tabela) + 1))
+        tabela.insert(0, "Modelo", nome)
+        tabelas.append(tabela)
+        print(f"   ✔ {grupo} | {nome}: {len(busca.cv_results_['params'])} avaliações em {busca.n_iterations_} rodadas")
+
+    return pd.concat(tabelas, ignore_index=True)
+
+
+if __name__ == "__main__":
+    modelos = modelos_base()
+    os.makedirs(PASTA_EXCEL, exist_ok=True)
+
+    for sufixo, grupo in PLANO["grupos"].items():
+        leaderboard = buscar_grupo(grupo, modelos)
+        caminho_excel = os.path.join(PASTA_EXCEL, f"busca_hiperparametros_{sufixo}.xlsx")
+        leaderboard.to_excel(caminho_excel, index=False)
+        print(leaderboard.to_string(index=False))
+        print(f"Arquivo Excel salvo em: {caminho_excel}")
@@ -0,0 +1,214 @@
+# -------------------------------------------------------------------------------------------
+# PLANO DE EXPERIMENTAÇÃO PARAMETRIZADO (substitui tabela_alta/media/baixa/clustering.py)
+#
+# Objetivo:
+# Rodar a grade grupos × seletores × modelos do plano de experimentação a partir de uma
+# única especificação (PLANO), em vez de quatro cópias do mesmo script que só mudavam o
+# caminho de entrada e o nome do Excel.
+#
+# Funcionamento:
+# - Cada célula (grupo, seletor, modelo) faz: split 70/30, seleção de variáveis no treino,
+#   ajuste do modelo, previsão no teste e cross_val_predict (3 folds) no treino.
+# - As células rodam em paralelo (ProcessPoolExecutor).
+# - O resultado de cada célula fica em cache (PlanoEx/.cache_experimentos), identificado por
+#   um hash da configuração (parâmetros do seletor/modelo, split, folds) e dos dados do grupo.
+#   Ao rodar o plano de novo, só as células novas ou alteradas são recalculadas.
+# - Gera um Excel por grupo em PlanoEx/Excel, com os mesmos nomes e colunas de antes.
+# -------------------------------------------------------------------------------------------
+
+import hashlib
+import json
+import os
+import sys
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.feature_selection import SelectKBest, f_regression, RFE
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import mean_squared_error, r2_score
+from sklearn.model_selection import train_test_split, KFold, cross_val_predict
+
+warnings.filterwarnings("ignore")
+
+# Carregamento compartilhado das planilhas (Analise_Sprint03/carregamento.py)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Analise_Sprint03.carregamento import carregar_grupo
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+PASTA_EXCEL = os.path.join(PASTA, "Excel")
+PASTA_CACHE = os.path.join(PASTA, ".cache_experimentos")
+N_PROCESSOS = None  # None = todos os núcleos disponíveis
+
+# === Especificação do plano ===
+PLANO = {
+    # sufixo do Excel → grupo do carregamento compartilhado
+    "grupos": {
+        "alta": "Alta Sensibilidade",
+        "media": "Média Sensibilidade",
+        "baixa": "Baixa Sensibilidade",
+        "clustering": "Todas as Doenças",
+    },
+    "seletores": {
+        "SelectKBest": SelectKBest(score_func=f_regression, k=10),
+        "RFE": RFE(estimator=LinearRegression(), n_features_to_select=10),
+    },
+    "modelos": {
+        "LinearRegression": LinearRegression(),
+        "RandomForest": RandomForestRegressor(random_state=42),
+    },
+    "test_size": 0.3,
+    "random_state": 42,
+    "n_folds": 3,
+}
+
+
+# === Funções auxiliares ===
+def identificar_estacao(mes):
+    if mes in [12, 1, 2]: return 'verao'
+    elif mes in [3, 4, 5]: return 'outono'
+    elif mes in [6, 7, 8]: return 'inverno'
+    else: return 'primavera'
+
+mapa_qualidade = {"Boa": 0, "Moderada": 1, "Ruim": 2, "Muito Ruim": 3, "Péssima": 4}
+
+def avaliar_metricas(y_true, y_pred, X_test):
+    n = len(y_true)
+    p = X_test.shape[1]
+    r2 = r2_score(y_true, y_pred)
+    r2_ajustado = 1 - (1 - r2) * (n - 1) / (n - p - 1)
+    rmse = np.sqrt(mean_squared_error(y_true, y_pred))
+    return {"RMSE": rmse, "R2": r2, "R2_Ajustado": r2_ajustado}
+
+
+# === Preprocessamento de um grupo (igual ao das antigas tabela_*.py) ===
+def preparar_grupo(grupo):
+    df = carregar_grupo(grupo)
+    df["estacao"] = df["mes"].apply(identificar_estacao)
+    df["qualidade_ar_ordinal"] = df["QUALIDADE_AR_CLASSIFICADA"].map(mapa_qualidade)
+    df["log_OBITOS"] = np.log1p(df["OBITOS"])
+    df = pd.get_dummies(df, columns=["Categoria CID-10", "estacao"], drop_first=True)
+
+    features_base = ["AREA_DESMATADA_KM2", "FRP", "RISCOFOGO", "PRECIPITACAO", "DIASEMCHUVA", "pm2.5_atm", "qualidade_ar_ordinal"]
+    features_base += [col for col in df.columns if col.startswith("Categoria CID-10_") or col.startswith("estacao_")]
+
+    X = df[features_base].fillna(df[features_base].mean())
+    y = df["log_OBITOS"].fillna(df["log_OBITOS"].mean())
+    return X, y
+
+
+# === Cache das células ===
+def hash_dados(X, y):
+    h = hashlib.sha1()
+    h.update(json.dumps(list(X.columns)).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(X, index=True).values.tobytes())
+    h.update(pd.util.hash_pandas_object(y, index=True).values.tobytes())
+    return h.hexdigest()
+
+
+def _descrever(valor):
+    # Representação estável dos parâmetros (sem endereços de memória de funções/objetos)
+    if hasattr(valor, "get_params"):
+        return [type(valor).__name__, sorted((k, _descrever(v)) for k, v in valor.get_params(deep=False).items())]
+    if callable(valor):
+        return f"{getattr(valor, '__module__', '')}.{getattr(valor, '__qualname__', repr(valor))}"
+    return repr(valor)
+
+
+def hash_celula(seletor, modelo, plano, hash_X_y):
+    config = {
+        "seletor": _descrever(seletor),
+        "modelo": _descrever(modelo),
+        "split": [plano["test_size"], plano["random_state"], plano["n_folds"]],
+        "dados": hash_X_y,
+    }
+    return hashlib.sha1(json.dumps(config).encode("utf-8")).hexdigest()
+
+
+# === Execução de uma célula ===
+def executar_celula(X, y, seletor, modelo, test_size, random_state, n_folds):
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=test_size, random_state=random_state)
+
+    seletor = clone(seletor).fit(X_train, y_train)
+    X_train_sel = seletor.transform(X_train)
+    X_test_sel = seletor.transform(X_test)
+
+    modelo = clone(modelo)
+    modelo.fit(X_train_sel, y_train)
+    y_pred_test = modelo.predict(X_test_sel)
+
+    # Treino com cross-val
+    kf = KFold(n_splits=n_folds, shuffle=True, random_state=random_state)
+    y_pred_train_cv = cross_val_predict(modelo, X_train_sel, y_train, cv=kf)
+
+    metricas_treino = avaliar_metricas(y_train, y_pred_train_cv, X_train_sel)
+    metricas_teste = avaliar_metricas(y_test, y_pred_test, X_test_sel)
+
+    return {
+        "RMSE_Treino": round(metricas_treino["RMSE"], 4),
+        "RMSE_Teste": round(metricas_teste["RMSE"], 4),
+        "R2_Treino": round(metricas_treino["R2"], 4),
+        "R2_Teste": round(metricas_teste["R2"], 4),
+        "R2_Ajustado_Treino": round(metricas_treino["R2_Ajustado"], 4),
+        "R2_Ajustado_Teste": round(metricas_teste["R2_Ajustado"], 4),
+    }
+
+
+def executar_plano(plano, n_processos=N_PROCESSOS):
+    os.makedirs(PASTA_CACHE, exist_ok=True)
+
+    # Monta as células na ordem da especificação e separa as que já estão em cache
+    celulas = []
+    dados = {}
+    for sufixo, grupo in plano["grupos"].items():
+        X, y = preparar_grupo(grupo)
+        dados[sufixo] = (X, y)
+        hash_X_y = hash_dados(X, y)
+        for nome_sel, seletor in plano["seletores"].items():
+            for nome_mod, modelo in plano["modelos"].items():
+                chave = hash_celula(seletor, modelo, plano, hash_X_y)
+                celulas.append({
+                    "sufixo": sufixo, "Modelo": nome_mod, "Seletor": nome_sel,
+                    "seletor": seletor, "modelo": modelo,
+                    "cache": os.path.join(PASTA_CACHE, f"{chave}.json"),
+                })
+
+    pendentes = [c for c in celulas if not os.path.exists(c["cache"])]
+    print(f"🧪 {len(celulas)} células no plano, {len(celulas) - len(pendentes)} reaproveitadas do cache")
+
+    if pendentes:
+        with ProcessPoolExecutor(max_workers=n_processos) as executor:
+            futuros = {
+                executor.submit(
+                    executar_celula, *dados[c["sufixo"]], c["seletor"], c["modelo"],
+                    plano["test_size"], plano["random_state"], plano["n_folds"]
+                ): c
+                for c in pendentes
+            }
+            for futuro, c in futuros.items():
+                metricas = futuro.result()
+                with open(c["cache"], "w", encoding="utf-8") as f:
+                    json.dump(metricas, f)
+                print(f"   ✔ {c['sufixo']} | {c['Seletor']} | {c['Modelo']}")
+
+    # Monta as tabelas de resultado por grupo a partir do cache
+    resultados = {}
+    for c in celulas:
+        with open(c["cache"], "r", encoding="utf-8") as f:
+            metricas = json.load(f)
+        resultados.setdefault(c["sufixo"], []).append({"Modelo": c["Modelo"], "Seletor": c["Seletor"], **metricas})
+    return {sufixo: pd.DataFrame(linhas) for sufixo, linhas in resultados.items()}
+
+
+if __name__ == "__main__":
+    resultados = executar_plano(PLANO)
+
+    # === Exportar para Excel ===
+    os.makedirs(PASTA_EXCEL, exist_ok=True)
+    for sufixo, df_resultados in resultados.items():
+        caminho_excel = os.path.join(PASTA_EXCEL, f"plano_experimentacao_resultados_{sufixo}.xlsx")
+        df_resultados.to_excel(caminho_excel, index=False)
+        print(f"Arquivo Excel salvo em: {caminho_excel}")
@@ -0,0 +1,111 @@
+# -------------------------------------------------------------------------------------------
+# CACHE COLUNAR DOS CSVs BRUTOS (base_dados)
+#
+# Objetivo:
+# Evitar que cada etapa faça de novo o parsing dos CSVs de texto (mortalidade, sensores
+# PurpleAir, focos de queimadas e desmatamento). Na primeira leitura o DataFrame já tipado
+# é salvo em formato binário colunar (Parquet); nas execuções seguintes ele é carregado
+# direto do cache.
+#
+# Invalidação automática:
+# - Cada entrada é identificada pelo caminho do CSV e pelos parâmetros do read_csv.
+# - Junto do arquivo em cache fica um .json com tamanho, mtime e hash do conteúdo do CSV.
+# - Se tamanho e mtime batem, o cache é usado. Se só o mtime mudou (ex.: arquivo copiado),
+#   o hash do conteúdo decide. Qualquer outra mudança refaz o cache.
+#
+# Observações:
+# - Usa Parquet (pyarrow). Se o pyarrow não estiver instalado, cai para pickle.
+# - Os arquivos ficam em uma pasta .cache ao lado do CSV de origem (ignorada pelo git).
+# -------------------------------------------------------------------------------------------
+
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    FORMATO_CACHE = "parquet"
+except ImportError:
+    FORMATO_CACHE = "pickle"
+
+PASTA_CACHE = ".cache"
+
+
+def hash_arquivo(caminho, tamanho_bloco=1 << 20):
+    h = hashlib.sha1()
+    with open(caminho, "rb") as f:
+        for bloco in iter(lambda: f.read(tamanho_bloco), b""):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def _caminhos_cache(caminho, kwargs):
+    # A chave combina o caminho absoluto do CSV com os parâmetros de leitura,
+    # já que o mesmo arquivo lido com outro sep/encoding gera outro DataFrame
+    caminho_abs = os.path.abspath(caminho)
+    chave = json.dumps([caminho_abs, sorted(kwargs.items())], default=str)
+    chave = hashlib.sha1(chave.encode("utf-8")).hexdigest()[:16]
+
+    pasta = os.path.join(os.path.dirname(caminho_abs), PASTA_CACHE)
+    base = os.path.join(pasta, f"{os.path.basename(caminho_abs)}.{chave}")
+    return pasta, f"{base}.{FORMATO_CACHE}", f"{base}.json"
+
+
+def _cache_valido(caminho, caminho_meta):
+    if not os.path.exists(caminho_meta):
+        return False
+
+    with open(caminho_meta, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+
+    info = os.stat(caminho)
+    if meta.get("formato") != FORMATO_CACHE or meta.get("tamanho") != info.st_size:
+        return False
+    if meta.get("mtime_ns") == info.st_mtime_ns:
+        return True
+
+    # mtime diferente com mesmo tamanho: confere o conteúdo antes de descartar
+    if meta.get("sha1") == hash_arquivo(caminho):
+        meta["mtime_ns"] = info.st_mtime_ns
+        with open(caminho_meta, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        return True
+    return False
+
+
+def ler_csv_cache(caminho, **kwargs):
+    """Equivalente a pd.read_csv(caminho, **kwargs), usando o cache colunar quando válido."""
+    pasta, caminho_cache, caminho_meta = _caminhos_cache(caminho, kwargs)
+
+    if os.path.exists(caminho_cache) and _cache_valido(caminho, caminho_meta):
+        if FORMATO_CACHE == "parquet":
+            return pd.read_parquet(caminho_cache)
+        return pd.read_pickle(caminho_cache)
+
+    df = pd.read_csv(caminho, **kwargs)
+
+    os.makedirs(pasta, exist_ok=True)
+    try:
+        if FORMATO_CACHE == "parquet":
+            df.to_parquet(caminho_cache, index=False)
+        else:
+            df.to_pickle(caminho_cache)
+    except (ValueError, TypeError) as e:
+        # Colunas com tipos mistos podem não ser serializáveis; segue sem cache
+        print(f"⚠️  Cache não gerado para {caminho}: {e}")
+        return df
+
+    info = os.stat(caminho)
+    meta = {
+        "origem": os.path.abspath(caminho),
+        "formato": FORMATO_CACHE,
+        "tamanho": info.st_size,
+        "mtime_ns": info.st_mtime_ns,
+        "sha1": hash_arquivo(caminho),
+    }
+    with open(caminho_meta, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+    return df
@@ -1,10 +1,15 @@
-import pandas as pd
+import os
+import sys
+
+# Cache colunar compartilhado (base_dados/cache_colunar.py)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cache_colunar import ler_csv_cache
 
 # 1. Carregar todos os dados mensais do Amazonas (com todos os anos)
-df_amazonas = pd.read_csv("desmatamento_mensal_amazonas.csv", sep=";")
+df_amazonas = ler_csv_cache("desmatamento_mensal_amazonas.csv", sep=";")
 
 # 2. Carregar os dados anuais de Manaus
-df_manaus = pd.read_csv("desmatamento_anual_manaus.csv", sep=",")
+df_manaus = ler_csv_cache("desmatamento_anual_manaus.csv", sep=",")
 df_manaus.columns = ["year", "areakm", "municipality", "geocode_ibge", "state"]
 df_manaus["year"] = df_manaus["year"].astype(int)
 df_manaus["areakm"] = df_manaus["areakm"].astype(float)
@@ -0,0 +1,135 @@
+# -------------------------------------------------------------------------------------------
+# ÍNDICE ESPACIAL DOS FOCOS DE QUEIMADA (EXPOSIÇÃO FOCO → RECEPTOR)
+#
+# Objetivo:
+# Os arquivos de focos trazem Latitude/Longitude de cada detecção, mas o queimadas.py só faz a
+# média das coordenadas por mês e descarta a informação espacial. Aqui os focos são indexados
+# em uma KD-tree para responder, em lote, consultas como "nº de focos e FRP somado a até R km
+# de cada receptor (sensor PurpleAir, centroide de município), por dia".
+#
+# Funcionamento:
+# - Latitude/longitude viram coordenadas 3D sobre a esfera (em km). A distância em linha reta
+#   (corda) cresce com a distância sobre a superfície, então "até R km sobre a Terra" é uma
+#   consulta de raio exata na KD-tree (scipy cKDTree), com o raio convertido para corda.
+# - A árvore é montada uma vez com todos os focos de todos os dias; cada receptor faz uma única
+#   consulta de raio (no maior raio pedido) e só os pares foco-receptor encontrados são
+#   processados. O custo por consulta é O(log n + k), sem a matriz completa de distâncias.
+# - Os pares são agrupados por (dia, receptor) e por raio, de forma vetorizada.
+#
+# Receptores: RECEPTORES (nome → latitude, longitude) ou um CSV com colunas nome, latitude e
+# longitude (ler_receptores). As coordenadas dos sensores PurpleAir não estão nos CSVs de
+# qualidade do ar; para usá-los como receptores, exporte-as para esse CSV.
+#
+# Saída padrão: base_dados/exposicao_focos_receptores.csv
+# -------------------------------------------------------------------------------------------
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+PASTA_BASE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(PASTA_BASE)
+from cache_colunar import ler_csv_cache
+from serie_diaria import PASTA_QUEIMADAS
+
+RAIO_TERRA_KM = 6371.0088
+RAIOS_KM = [10, 25, 50]
+
+# Centroide aproximado da área urbana de Manaus
+RECEPTORES = {
+    "Manaus (centroide)": (-3.1190, -60.0217),
+}
+
+
+def coordenadas_3d(latitude, longitude):
+    """Pontos (n, 3) em km sobre a esfera terrestre."""
+    lat = np.radians(np.asarray(latitude, dtype=float))
+    lon = np.radians(np.asarray(longitude, dtype=float))
+    return RAIO_TERRA_KM * np.column_stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+
+
+def corda_para_km(corda):
+    # Distância sobre a superfície (grande círculo) correspondente à corda
+    return 2 * RAIO_TERRA_KM * np.arcsin(np.clip(corda / (2 * RAIO_TERRA_KM), 0, 1))
+
+
+def km_para_corda(distancia_km):
+    return 2 * RAIO_TERRA_KM * np.sin(np.asarray(distancia_km, dtype=float) / (2 * RAIO_TERRA_KM))
+
+
+def ler_receptores(caminho=None):
+    """Receptores (nome, latitude, longitude) de um CSV ou de RECEPTORES."""
+    if caminho is not None:
+        return ler_csv_cache(caminho)[["nome", "latitude", "longitude"]]
+    return pd.DataFrame(
+        [(nome, lat, lon) for nome, (lat, lon) in RECEPTORES.items()],
+        columns=["nome", "latitude", "longitude"],
+    )
+
+
+def focos_georreferenciados(arquivos=None):
+    """Focos com dia, coordenadas e FRP (focos sem data ou coordenada são descartados)."""
+    if arquivos is None:
+        arquivos = sorted(os.path.join(PASTA_QUEIMADAS, n) for n in os.listdir(PASTA_QUEIMADAS) if n.endswith(".csv"))
+    partes = []
+    for caminho in arquivos:
+        df = ler_csv_cache(caminho)
+        df["data"] = pd.to_datetime(df["DataHora"], errors="coerce").dt.floor("D")
+        df[["Latitude", "Longitude", "FRP"]] = df[["Latitude", "Longitude", "FRP"]].apply(pd.to_numeric, errors="coerce")
+        partes.append(df[["data", "Latitude", "Longitude", "FRP"]])
+    return pd.concat(partes, ignore_index=True).dropna(subset=["data", "Latitude", "Longitude"])
+
+
+def indexar_focos(focos):
+    """KD-tree dos focos (uma única vez para todos os dias)."""
+    return cKDTree(coordenadas_3d(focos["Latitude"], focos["Longitude"]))
+
+
+def pares_no_raio(arvore, receptores, raio_km):
+    """Pares (receptor, foco) a até raio_km, com a distância em km, de uma consulta em lote."""
+    pontos = coordenadas_3d(receptores["latitude"], receptores["longitude"])
+    vizinhos = arvore.query_ball_point(pontos, km_para_corda(raio_km), return_sorted=False)
+
+    tamanhos = np.fromiter((len(v) for v in vizinhos), dtype=np.int64, count=len(vizinhos))
+    i_receptor = np.repeat(np.arange(len(vizinhos)), tamanhos)
+    i_foco = np.concatenate([np.asarray(v, dtype=np.int64) for v in vizinhos]) if tamanhos.sum() else np.empty(0, dtype=np.int64)
+    distancia = corda_para_km(np.linalg.norm(arvore.data[i_foco] - pontos[i_receptor], axis=1))
+    return i_receptor, i_foco, distancia
+
+
+def exposicao_receptores(focos, receptores, raios_km=RAIOS_KM, arvore=None):
+    """Nº de focos e FRP somado a até cada raio, por dia e receptor (só dias com algum foco no raio)."""
+    arvore = indexar_focos(focos) if arvore is None else arvore
+    i_receptor, i_foco, distancia = pares_no_raio(arvore, receptores, max(raios_km))
+
+    pares = pd.DataFrame({
+        "data": focos["data"].to_numpy()[i_foco],
+        "receptor": receptores["nome"].to_numpy()[i_receptor],
+        "FRP": focos["FRP"].to_numpy(dtype=float)[i_foco],
+    })
+
+    tabelas = []
+    for raio in sorted(raios_km):
+        agregado = pares[distancia <= raio].groupby(["data", "receptor"]).agg(
+            n_focos=("FRP", "size"), FRP_soma=("FRP", "sum"),
+        )
+        tabelas.append(agregado.add_suffix(f"_{raio}km"))
+
+    exposicao = pd.concat(tabelas, axis=1).fillna(0)
+    return exposicao.astype({c: "int64" for c in exposicao.columns if c.startswith("n_focos")}).sort_index()
+
+
+if __name__ == "__main__":
+    focos = focos_georreferenciados()
+    receptores = ler_receptores(sys.argv[1] if len(sys.argv) > 1 else None)
+    print(f"🛰️  {len(focos)} focos indexados, {len(receptores)} receptores, raios {RAIOS_KM} km")
+
+    exposicao = exposicao_receptores(focos, receptores)
+    caminho_saida = os.path.join(PASTA_BASE, "exposicao_focos_receptores.csv")
+    exposicao.to_csv(caminho_saida)
+
+    print(exposicao.sort_values(f"FRP_soma_{max(RAIOS_KM)}km", ascending=False).head(10).to_string())
+    print(f"✅ Exposição salva em: {caminho_saida}")
@@ -1,5 +1,11 @@
 import pandas as pd
 import glob
+import os
+import sys
+
+# Cache colunar compartilhado (base_dados/cache_colunar.py)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cache_colunar import ler_csv_cache
 
 # Caminho dos arquivos de mortalidade
 mortalidade_path = 'base_dados/mortalidade'
@@ -17,7 +23,7 @@ for file in glob.glob(f'{mortalidade_path}/mortalidade_*.csv'):
     ano = int(file[-8:-4])
     print(f"🔄 Lendo {file} (ano {ano})")
 
-    df = pd.read_csv(file, sep=';', encoding='latin1')
+    df = ler_csv_cache(file, sep=';', encoding='latin1')
 
     # Padronizar nome das colunas
     df.columns = [col.strip().replace('"', '').replace('Munic�pio', 'Municipio').replace('Marco', 'Março') for col in df.columns]
@@ -1,32 +1,75 @@
-import os
 import pandas as pd
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+# Cache colunar compartilhado (base_dados/cache_colunar.py)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cache_colunar import ler_csv_cache
 
 # Caminho para a pasta com os CSVs
 pasta_csvs = "base_dados/qualidade_Ar"
 
-# Lista para armazenar os DataFrames de cada sensor
-dataframes = []
+# Modo paralelo: cada sensor é lido e reduzido a médias mensais em um processo separado.
+# O processo principal só acumula somas e contagens por (ano, mes), então o resultado
+# é igual ao concat().groupby().mean() do modo sequencial.
+MODO_PARALELO = True
+N_PROCESSOS = None  # None = todos os núcleos disponíveis
+
+colunas = ['pm2.5_atm', 'humidity', 'temperature', 'pressure']
+
+
+def media_mensal_sensor(caminho):
+    df = ler_csv_cache(caminho)
+
+    # Converte timestamp ISO para datetime
+    df['datetime'] = pd.to_datetime(df['time_stamp'], utc=True)
+    df['ano'] = df['datetime'].dt.year
+    df['mes'] = df['datetime'].dt.month
+
+    # Agrupa por ano e mês e calcula a média dos campos desejados
+    return df.groupby(['ano', 'mes'])[colunas].mean().reset_index()
+
+
+def media_entre_sensores(medias_sensores):
+    # Soma e contagem (valores não nulos) das médias mensais de cada sensor.
+    # A média final por coluna é soma / contagem, como no mean() após o concat.
+    somas = None
+    contagens = None
+    for df_media in medias_sensores:
+        df_media = df_media.set_index(['ano', 'mes'])
+        if somas is None:
+            somas, contagens = df_media.fillna(0), df_media.notna().astype(int)
+        else:
+            somas = somas.add(df_media.fillna(0), fill_value=0)
+            contagens = contagens.add(df_media.notna().astype(int), fill_value=0)
+
+    df_unificado = somas / contagens.where(contagens > 0)
+    return df_unificado.sort_index().reset_index()
 
-# Percorrer todos os arquivos CSV da pasta
-for nome_arquivo in os.listdir(pasta_csvs):
-    if nome_arquivo.endswith(".csv"):
-        caminho = os.path.join(pasta_csvs, nome_arquivo)
-        df = pd.read_csv(caminho)
 
-        # Converte timestamp ISO para datetime
-        df['datetime'] = pd.to_datetime(df['time_stamp'], utc=True)
-        df['ano'] = df['datetime'].dt.year
-        df['mes'] = df['datetime'].dt.month
+if __name__ == "__main__":
+    caminhos = [
+        os.path.join(pasta_csvs, nome_arquivo)
+        for nome_arquivo in os.listdir(pasta_csvs)
+        if nome_arquivo.endswith(".csv")
+    ]
 
-        # Agrupa por ano e mês e calcula a média dos campos desejados
-        df_media = df.groupby(['ano', 'mes'])[['pm2.5_atm', 'humidity', 'temperature', 'pressure']].mean().reset_index()
-        dataframes.append(df_media)
+    if MODO_PARALELO:
+        # Lotes de arquivos por tarefa reduzem o custo de comunicação com centenas de sensores
+        n_processos = N_PROCESSOS or os.cpu_count() or 1
+        lote = max(1, len(caminhos) // (4 * n_processos))
+        with ProcessPoolExecutor(max_workers=n_processos) as executor:
+            df_unificado = media_entre_sensores(executor.map(media_mensal_sensor, caminhos, chunksize=lote))
+    else:
+        # Lista para armazenar os DataFrames de cada sensor
+        dataframes = [media_mensal_sensor(caminho) for caminho in caminhos]
 
-# Unifica todos os sensores pela média entre eles
-df_unificado = pd.concat(dataframes).groupby(['ano', 'mes']).mean().reset_index()
+        # Unifica todos os sensores pela média entre eles
+        df_unificado = pd.concat(dataframes).groupby(['ano', 'mes']).mean().reset_index()
 
-# Exibe o resultado final
-print(df_unificado)
+    # Exibe o resultado final
+    print(df_unificado)
 
-# (Opcional) salva em CSV
-df_unificado.to_csv("media_mensal_qualidade_ar_manaus.csv", sep=';', index=False)
+    # (Opcional) salva em CSV
+    df_unificado.to_csv("media_mensal_qualidade_ar_manaus.csv", sep=';', index=False)
@@ -1,16 +1,27 @@
 import pandas as pd
 import os
+import sys
+
+# Cache colunar compartilhado (base_dados/cache_colunar.py)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cache_colunar import ler_csv_cache
 
 # Caminho dos arquivos
 folder = 'C:/Users/Allyson/ENG4040/base_dados/queimadas'
 arquivos = [f for f in os.listdir(folder) if f.endswith('.csv')]
 
-dfs = []
+# Modo streaming: lê cada arquivo em blocos de TAMANHO_CHUNK linhas e mantém apenas
+# somas e contagens por (Ano, Mes, Satelite). O pico de memória passa a depender do
+# número de grupos, e não do número de focos. O resultado é o mesmo do modo original.
+MODO_STREAMING = True
+TAMANHO_CHUNK = 100_000
+
+# Colunas numéricas agregadas por Ano, Mês e Satélite
+colunas_numericas = ['DiaSemChuva', 'Precipitacao', 'RiscoFogo', 'Latitude', 'Longitude', 'FRP']
+chaves = ['Ano', 'Mes', 'Satelite']
 
-for arquivo in arquivos:
-    path = os.path.join(folder, arquivo)
-    df = pd.read_csv(path)
 
+def preparar_focos(df):
     df['DataHora'] = pd.to_datetime(df['DataHora'], errors='coerce')
     df['Ano'] = df['DataHora'].dt.year
     df['Mes'] = df['DataHora'].dt.month
@@ -18,26 +29,78 @@ for arquivo in arquivos:
     # Substitui valores de RiscoFogo -999 por NaN
     df['RiscoFogo'] = pd.to_numeric(df['RiscoFogo'], errors='coerce')
     df.loc[df['RiscoFogo'] <= -100, 'RiscoFogo'] = None  # valores inválidos
+    return df
 
-    dfs.append(df)
 
-# Junta tudo
-df_total = pd.concat(dfs)
+def agregar_streaming(folder, arquivos, tamanho_chunk=TAMANHO_CHUNK):
+    # Acumuladores por grupo: soma e contagem de valores não nulos de cada coluna
+    somas = None
+    contagens = None
+    anos = set()
+    satelites = []
+    data_invalida = False
 
-# Agrupa por Ano, Mês e Satélite, calculando média
-colunas_numericas = ['DiaSemChuva', 'Precipitacao', 'RiscoFogo', 'Latitude', 'Longitude', 'FRP']
-df_agrupado = df_total.groupby(['Ano', 'Mes', 'Satelite'])[colunas_numericas].mean().reset_index()
+    for arquivo in arquivos:
+        path = os.path.join(folder, arquivo)
+        # A leitura em blocos vai direto ao CSV: carregar o cache colunar inteiro
+        # anularia o limite de memória deste modo
+        for chunk in pd.read_csv(path, chunksize=tamanho_chunk):
+            chunk = preparar_focos(chunk)
+            chunk[colunas_numericas] = chunk[colunas_numericas].apply(pd.to_numeric, errors='coerce')
+
+            data_invalida = data_invalida or chunk['DataHora'].isna().any()
+            anos.update(chunk['Ano'].dropna().unique())
+            for satelite in chunk['Satelite'].dropna().unique():
+                if satelite not in satelites:
+                    satelites.append(satelite)
+
+            grupos = chunk.groupby(chaves)[colunas_numericas]
+            soma_chunk = grupos.sum()
+            contagem_chunk = grupos.count()
+
+            if somas is None:
+                somas, contagens = soma_chunk, contagem_chunk
+            else:
+                somas = somas.add(soma_chunk, fill_value=0)
+                contagens = contagens.add(contagem_chunk, fill_value=0)
+
+    # Média = soma / contagem (grupos sem valores válidos ficam NaN, como no mean())
+    df_agrupado = (somas / contagens.where(contagens > 0)).reset_index()
+
+    # Mesmo tipo de Ano/Mes do modo original (float quando há DataHora inválida)
+    tipo_chave = float if data_invalida else int
+    df_agrupado[['Ano', 'Mes']] = df_agrupado[['Ano', 'Mes']].astype(tipo_chave)
+    anos = sorted(tipo_chave(ano) for ano in anos)
+    return df_agrupado, anos, satelites
+
+
+if MODO_STREAMING:
+    df_agrupado, anos, satelites = agregar_streaming(folder, arquivos)
+else:
+    dfs = []
+
+    for arquivo in arquivos:
+        path = os.path.join(folder, arquivo)
+        df = ler_csv_cache(path)
+        dfs.append(preparar_focos(df))
+
+    # Junta tudo
+    df_total = pd.concat(dfs)
+
+    # Agrupa por Ano, Mês e Satélite, calculando média
+    df_agrupado = df_total.groupby(chaves)[colunas_numericas].mean().reset_index()
+
+    anos = sorted(df_total['Ano'].dropna().unique())
+    satelites = df_total['Satelite'].dropna().unique()
 
 # Preenche meses ausentes
-anos = sorted(df_total['Ano'].dropna().unique())
 meses = range(1, 13)
-satelites = df_total['Satelite'].dropna().unique()
-index_completo = pd.MultiIndex.from_product([anos, meses, satelites], names=['Ano', 'Mes', 'Satelite'])
+index_completo = pd.MultiIndex.from_product([anos, meses, satelites], names=chaves)
 df_completo = pd.DataFrame(index=index_completo).reset_index()
 
 # Junta com os dados reais
-df_final = pd.merge(df_completo, df_agrupado, on=['Ano', 'Mes', 'Satelite'], how='left')
-df_final.sort_values(by=['Ano', 'Mes', 'Satelite'], inplace=True)
+df_final = pd.merge(df_completo, df_agrupado, on=chaves, how='left')
+df_final.sort_values(by=chaves, inplace=True)
 
 # Salva
 df_final.to_csv('queimadas_unificadas.csv', index=False)
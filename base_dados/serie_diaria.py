@@ -0,0 +1,224 @@
+# -------------------------------------------------------------------------------------------
+# ARMAZÉM DIÁRIO/HORÁRIO DAS VARIÁVEIS AMBIENTAIS (ALTERNATIVA AO PIPELINE MENSAL)
+#
+# Objetivo:
+# queimadas.py e qualidade.py reduzem tudo a (ano, mês) logo na leitura, então estudos de
+# exposição de curto prazo precisavam voltar aos arquivos brutos. Aqui a ingestão é feita uma
+# única vez em grão fino, e os agregados mensais saem desse armazém, sem reprocessar os brutos.
+#
+# Armazém (base_dados/.cache/serie_diaria, ignorado pelo git), indexado por data:
+# - focos_diarios: um registro por dia × satélite com nº de focos, soma de FRP e soma/contagem
+#   de RiscoFogo, DiaSemChuva e Precipitacao (RiscoFogo ≤ -100 é inválido, como em queimadas.py)
+# - pm25_horario: um registro por hora × sensor com soma/contagem de pm2.5_atm, umidade,
+#   temperatura e pressão
+# Guardar somas e contagens (e não médias) permite reagrupar em qualquer grão maior com o
+# mesmo resultado de agregar os brutos: dia → mês em O(dias), hora → dia em O(horas).
+#
+# Reconstrução: o armazém é refeito só quando algum CSV de origem muda (tamanho/mtime, com
+# hash de conteúdo como desempate, via base_dados/cache_colunar.py). Use "--forcar" para refazer.
+#
+# Observação: os CSVs atuais do PurpleAir são médias de 43200 minutos (um valor por mês), então
+# a série "horária" de PM2.5 tem hoje um registro por mês e sensor; com exportações horárias ou
+# de 10 minutos o mesmo código gera a série horária completa.
+# -------------------------------------------------------------------------------------------
+
+import json
+import os
+import sys
+
+import pandas as pd
+
+PASTA_BASE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(PASTA_BASE)
+from cache_colunar import ler_csv_cache, hash_arquivo, FORMATO_CACHE
+
+PASTA_QUEIMADAS = os.path.join(PASTA_BASE, "queimadas")
+PASTA_QUALIDADE = os.path.join(PASTA_BASE, "qualidade_Ar")
+PASTA_ARMAZEM = os.path.join(PASTA_BASE, ".cache", "serie_diaria")
+CAMINHO_MANIFESTO = os.path.join(PASTA_ARMAZEM, "manifesto.json")
+
+COLUNAS_FOCOS = ["RiscoFogo", "DiaSemChuva", "Precipitacao"]
+COLUNAS_SENSOR = ["pm2.5_atm", "humidity", "temperature", "pressure"]
+
+
+def _arquivos(pasta):
+    return sorted(os.path.join(pasta, nome) for nome in os.listdir(pasta) if nome.endswith(".csv"))
+
+
+def _somas_contagens(df, chaves, colunas):
+    grupos = df.groupby(chaves, observed=True)[colunas]
+    somas = grupos.sum().add_prefix("soma_")
+    contagens = grupos.count().add_prefix("contagem_").astype("int32")
+    return somas.join(contagens)
+
+
+# === Ingestão em grão fino ===
+def focos_diarios(arquivos):
+    """Focos agregados por dia e satélite (índice: data, Satelite)."""
+    partes = []
+    for caminho in arquivos:
+        df = ler_csv_cache(caminho)
+        df["data"] = pd.to_datetime(df["DataHora"], errors="coerce").dt.floor("D")
+        df[COLUNAS_FOCOS + ["FRP"]] = df[COLUNAS_FOCOS + ["FRP"]].apply(pd.to_numeric, errors="coerce")
+        df.loc[df["RiscoFogo"] <= -100, "RiscoFogo"] = None  # valores inválidos
+        partes.append(df[["data", "Satelite", "FRP"] + COLUNAS_FOCOS])
+
+    df = pd.concat(partes, ignore_index=True).dropna(subset=["data"])
+    df["Satelite"] = df["Satelite"].astype("category")
+
+    chaves = ["data", "Satelite"]
+    diario = _somas_contagens(df, chaves, COLUNAS_FOCOS)
+    diario.insert(0, "soma_FRP", df.groupby(chaves, observed=True)["FRP"].sum())
+    diario.insert(0, "contagem_FRP", df.groupby(chaves, observed=True)["FRP"].count().astype("int32"))
+    diario.insert(0, "n_focos", df.groupby(chaves, observed=True).size().astype("int32"))
+    return diario.sort_index()
+
+
+def pm25_horario(arquivos):
+    """Leituras dos sensores agregadas por hora e sensor (índice: data_hora, sensor)."""
+    partes = []
+    for caminho in arquivos:
+        df = ler_csv_cache(caminho)
+        # Mesmo fuso do qualidade.py (UTC), guardado sem tz para indexar junto com os focos
+        df["data_hora"] = pd.to_datetime(df["time_stamp"], utc=True).dt.tz_convert(None).dt.floor("h")
+        df["sensor"] = os.path.basename(caminho).split()[0]
+        partes.append(df[["data_hora", "sensor"] + COLUNAS_SENSOR])
+
+    df = pd.concat(partes, ignore_index=True)
+    df["sensor"] = df["sensor"].astype("category")
+    return _somas_contagens(df, ["data_hora", "sensor"], COLUNAS_SENSOR).sort_index()
+
+
+# === Persistência ===
+def _caminho_tabela(nome):
+    return os.path.join(PASTA_ARMAZEM, f"{nome}.{FORMATO_CACHE}")
+
+
+def _salvar(df, nome):
+    if FORMATO_CACHE == "parquet":
+        df.to_parquet(_caminho_tabela(nome))
+    else:
+        df.to_pickle(_caminho_tabela(nome))
+
+
+def _ler(nome):
+    if FORMATO_CACHE == "parquet":
+        return pd.read_parquet(_caminho_tabela(nome))
+    return pd.read_pickle(_caminho_tabela(nome))
+
+
+def _assinatura(arquivos):
+    assinatura = {}
+    for caminho in arquivos:
+        info = os.stat(caminho)
+        assinatura[os.path.relpath(caminho, PASTA_BASE)] = [info.st_size, info.st_mtime_ns]
+    return assinatura
+
+
+def _armazem_atualizado(assinatura):
+    if not os.path.exists(CAMINHO_MANIFESTO):
+        return False
+    with open(CAMINHO_MANIFESTO, "r", encoding="utf-8") as f:
+        manifesto = json.load(f)
+    if manifesto.get("formato") != FORMATO_CACHE or set(manifesto["arquivos"]) != set(assinatura):
+        return False
+
+    for nome, (tamanho, mtime) in assinatura.items():
+        tamanho_antes, mtime_antes = manifesto["arquivos"][nome]
+        if tamanho != tamanho_antes:
+            return False
+        # mtime diferente com mesmo tamanho: confere o conteúdo antes de descartar
+        if mtime != mtime_antes and hash_arquivo(os.path.join(PASTA_BASE, nome)) != manifesto["sha1"][nome]:
+            return False
+    return True
+
+
+def construir_armazem(forcar=False):
+    arquivos_focos, arquivos_sensores = _arquivos(PASTA_QUEIMADAS), _arquivos(PASTA_QUALIDADE)
+    assinatura = _assinatura(arquivos_focos + arquivos_sensores)
+    if not forcar and _armazem_atualizado(assinatura):
+        print("✔ Armazém diário já atualizado")
+        return
+
+    os.makedirs(PASTA_ARMAZEM, exist_ok=True)
+    _salvar(focos_diarios(arquivos_focos), "focos_diarios")
+    _salvar(pm25_horario(arquivos_sensores), "pm25_horario")
+
+    manifesto = {
+        "formato": FORMATO_CACHE,
+        "arquivos": assinatura,
+        "sha1": {nome: hash_arquivo(os.path.join(PASTA_BASE, nome)) for nome in assinatura},
+    }
+    with open(CAMINHO_MANIFESTO, "w", encoding="utf-8") as f:
+        json.dump(manifesto, f, indent=2)
+    print(f"✅ Armazém diário gravado em {PASTA_ARMAZEM}")
+
+
+# === Consultas ===
+def _medias(somas_contagens, colunas):
+    medias = pd.DataFrame(index=somas_contagens.index)
+    for coluna in colunas:
+        contagem = somas_contagens[f"contagem_{coluna}"]
+        medias[coluna] = somas_contagens[f"soma_{coluna}"] / contagem.where(contagem > 0)
+    return medias
+
+
+def serie_focos(frequencia="D", por_satelite=False):
+    """Nº de focos, FRP total e médias de RiscoFogo/DiaSemChuva/Precipitacao por período ("D", "W", "MS"...)."""
+    diario = _ler("focos_diarios")
+    chaves = [pd.Grouper(level="data", freq=frequencia)] + (["Satelite"] if por_satelite else [])
+    somado = diario.groupby(chaves, observed=True).sum()
+
+    serie = _medias(somado, COLUNAS_FOCOS)
+    serie.insert(0, "FRP_soma", somado["soma_FRP"])
+    serie.insert(0, "n_focos", somado["n_focos"])
+    return serie
+
+
+def serie_pm25(frequencia="h", por_sensor=False):
+    """Médias dos sensores por período ("h", "D", "MS"...); sem por_sensor, média entre sensores."""
+    horario = _ler("pm25_horario")
+    por_periodo = horario.groupby([pd.Grouper(level="data_hora", freq=frequencia), "sensor"], observed=True).sum()
+    medias = _medias(por_periodo, COLUNAS_SENSOR)
+    if por_sensor:
+        return medias
+    # Média entre sensores do período (cada sensor pesa igual, como no qualidade.py)
+    return medias.groupby(level="data_hora").mean()
+
+
+def focos_mensais():
+    """Médias por (Ano, Mes, Satelite) no formato do agregado de queimadas.py, derivadas do armazém.
+
+    Como no queimadas.py, a grade é completa (anos × meses 1..12 × satélites): meses sem focos
+    de um satélite ficam com NaN.
+    """
+    diario = _ler("focos_diarios")
+    datas = diario.index.get_level_values("data")
+    somado = diario.groupby([datas.year.rename("Ano"), datas.month.rename("Mes"), "Satelite"], observed=True).sum()
+    medias = _medias(somado, COLUNAS_FOCOS)
+    medias["FRP"] = somado["soma_FRP"] / somado["contagem_FRP"].where(somado["contagem_FRP"] > 0)
+
+    grade = pd.MultiIndex.from_product(
+        [sorted(datas.year.unique()), range(1, 13), diario.index.get_level_values("Satelite").unique()],
+        names=["Ano", "Mes", "Satelite"],
+    )
+    return medias.reindex(grade).sort_index().reset_index()
+
+
+def qualidade_mensal():
+    """Médias mensais (ano, mes) entre sensores, no formato do qualidade.py, derivadas do armazém."""
+    mensal = serie_pm25("MS")
+    datas = mensal.index
+    return mensal.set_index([datas.year.rename("ano"), datas.month.rename("mes")]).reset_index()
+
+
+if __name__ == "__main__":
+    construir_armazem(forcar="--forcar" in sys.argv)
+
+    diario = serie_focos("D")
+    print(f"🔥 Focos: {len(diario)} dias na série, {int(diario['n_focos'].sum())} focos")
+    print(diario.sort_values("FRP_soma", ascending=False).head(5).round(2).to_string())
+
+    pm25 = serie_pm25("D")
+    print(f"🌫️  PM2.5: {len(pm25)} dias com leitura")
+    print(qualidade_mensal().head().round(3).to_string(index=False))